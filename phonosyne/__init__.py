@@ -9,19 +9,48 @@ Key features:
 - Marks the 'phonosyne' directory as a Python package.
 - Serves as the main entry point for importing package components.
 - Re-exports `run_prompt` and other necessary components from `phonosyne.sdk`.
+- Exports are resolved lazily (PEP 562 `__getattr__`), so `import phonosyne`
+  (e.g., to read `__version__`) does not load the `agents` SDK, the schemas or
+  the prompt files until one of the exported names is actually used.
 """
 
-# Import the OrchestratorAgent (if it's used directly or needs to be exported)
-from .agents.orchestrator import OrchestratorAgent
-
-# Import key functionalities from the sdk module
-from .sdk import OpenRouterModelProvider, run_prompt
+import importlib
+from typing import Any
 
 __version__ = "0.1.0"
 
+# Maps each lazily exported name to the submodule that defines it.
+_LAZY = {
+    "run_prompt": ".sdk",
+    "run_prompts": ".sdk",
+    "run_prompt_sync": ".sdk",
+    "analyze_sample": ".sdk",
+    "analyze_samples": ".sdk",
+    "OpenRouterModelProvider": ".sdk",  # Exporting for potential direct use or testing
+    "OrchestratorAgent": ".agents.orchestrator",
+}
+
 __all__ = [
     "run_prompt",
+    "run_prompts",
+    "run_prompt_sync",
+    "analyze_sample",
+    "analyze_samples",
     "OrchestratorAgent",
-    "OpenRouterModelProvider",  # Exporting for potential direct use or testing
+    "OpenRouterModelProvider",
     "__version__",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Cache so later lookups bypass __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
@@ -2,41 +2,44 @@
 Phonosyne Agents Subpackage
 
 This module initializes the `phonosyne.agents` subpackage.
-It will export the core agent classes (Designer, Analyzer, Compiler)
-and any Pydantic schemas used for data validation and transfer between agents.
+It exports the `agents` SDK based agent classes (Orchestrator, Designer,
+Analyzer, Compiler) and the Pydantic schemas used for data validation and
+transfer between agents.
 
 Key features:
 - Marks the 'phonosyne/agents' directory as a Python subpackage.
-- Will export AgentBase, DesignerAgent, AnalyzerAgent, CompilerAgent.
-- Will export Pydantic schemas like MovementStub, SampleStub, AnalyzerOut.
+- Exports OrchestratorAgent, DesignerAgent, AnalyzerAgent, CompilerAgent.
+- Exports Pydantic schemas like SampleStub, AnalyzerInput, AnalyzerOutput.
 
 @dependencies
-- Modules within this subpackage (e.g., `base`, `designer`, `analyzer`, `compiler`, `schemas`).
+- Modules within this subpackage (`orchestrator`, `designer`, `analyzer`,
+  `compiler`, `schemas`).
 
 @notes
-- Exports will be added as the respective components are implemented.
+- Exports are resolved lazily (PEP 562 `__getattr__`): importing one agent does
+  not load the other agents' modules or prompt files.
 """
 
-# TODO: Import and export AnalyzerAgent from .analyzer (Step 3.3)
-from .analyzer import AnalyzerAgent
+import importlib
+from typing import Any
 
-# AgentBase from .base is removed as it's deprecated (Step 11)
-
-# TODO: Import and export CompilerAgent from .compiler (Step 3.4)
-from .compiler import CompilerAgent
-
-# TODO: Import and export DesignerAgent from .designer (Step 3.2)
-from .designer import DesignerAgent, DesignerAgentInput
-
-# TODO: Import and export Pydantic schemas from .schemas (Step 2.2)
-from .schemas import (
-    AnalyzerInput,
-    AnalyzerOutput,
-    DesignerOutput,
-    SampleStub,
-)
+# Maps each lazily exported name to the submodule that defines it.
+_LAZY = {
+    "OrchestratorAgent": ".orchestrator",
+    "AnalyzerAgent": ".analyzer",
+    "CompilerAgent": ".compiler",
+    "DesignerAgent": ".designer",
+    "DesignerAgentInput": ".designer",
+    "AnalyzerInput": ".schemas",
+    "AnalyzerOutput": ".schemas",
+    "BatchAnalyzerInput": ".schemas",
+    "BatchAnalyzerOutput": ".schemas",
+    "DesignerOutput": ".schemas",
+    "SampleStub": ".schemas",
+}
 
 __all__ = [
+    "OrchestratorAgent",
     "DesignerAgent",
     "DesignerAgentInput",
     "AnalyzerAgent",
@@ -45,4 +48,20 @@ __all__ = [
     "DesignerOutput",
     "AnalyzerInput",
     "AnalyzerOutput",
+    "BatchAnalyzerInput",
+    "BatchAnalyzerOutput",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Cache so later lookups bypass __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
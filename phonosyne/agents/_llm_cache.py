@@ -0,0 +1,117 @@
+"""
+Persistent LLM Response Cache for Phonosyne Agents
+
+This module provides a small SQLite-backed key/value store for LLM responses,
+so repeated agent calls with identical inputs (development loops, re-runs of the
+same brief, downstream retries) can skip the network round trip entirely.
+
+Key features:
+- `make_key`: Derives a cache key from the model name, the agent's instructions
+  and the user input via SHA-256.
+- `get` / `put`: Read and write cached responses.
+- SQLite in WAL mode so concurrent readers do not block the writer.
+- `open_sqlite`: Opens a cache database in that mode; shared with `_semcache`.
+
+@dependencies
+- `sqlite3`, `hashlib`, `functools`, `threading`
+- `phonosyne.settings` (for `LLM_CACHE_ENABLED`, `LLM_CACHE_PATH`)
+
+@notes
+- Caching is opt-in via `settings.LLM_CACHE_ENABLED`; LLM outputs are sampled,
+  so serving a cached response changes behaviour for repeated prompts.
+- Only validated responses should be stored; callers are responsible for that.
+"""
+
+import functools
+import hashlib
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+
+from phonosyne import settings
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_connection: sqlite3.Connection | None = None
+
+
+def open_sqlite(path: str | Path, ddl: str) -> sqlite3.Connection:
+    """
+    Opens a cache database in WAL mode, creating its directory if needed.
+
+    Args:
+        path: The database file.
+        ddl: The `CREATE TABLE IF NOT EXISTS ...` statement for the cache table.
+
+    Returns:
+        A connection usable from any thread (callers serialize access).
+    """
+    db_path = Path(path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(ddl)
+    conn.commit()
+    return conn
+
+
+def _get_connection() -> sqlite3.Connection:
+    """Opens (once per process) the cache database and ensures the table exists."""
+    global _connection
+    with _lock:
+        if _connection is None:
+            _connection = open_sqlite(
+                settings.LLM_CACHE_PATH,
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+            )
+        return _connection
+
+
+def make_key(model: str, instructions: str, input_str: str) -> str:
+    """
+    Builds a cache key for an LLM call.
+
+    Args:
+        model: The model name the call is made against.
+        instructions: The agent's system prompt.
+        input_str: The user input passed to the agent.
+
+    Returns:
+        A hex SHA-256 digest identifying the call.
+    """
+    hasher = _prefix_hasher(model, instructions).copy()
+    hasher.update(input_str.encode())
+    return hasher.hexdigest()
+
+
+@functools.lru_cache(maxsize=16)
+def _prefix_hasher(model: str, instructions: str) -> "hashlib._Hash":
+    """
+    SHA-256 state after hashing the static (model, instructions) prefix, so each
+    key only hashes the per-call input instead of re-encoding the multi-KB prompt.
+    """
+    return hashlib.sha256(f"{model}\0{instructions}\0".encode())
+
+
+def get(key: str) -> str | None:
+    """Returns the cached response for `key`, or None on a miss."""
+    conn = _get_connection()
+    with _lock:
+        row = conn.execute(
+            "SELECT value FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+    return row[0] if row else None
+
+
+def put(key: str, value: str) -> None:
+    """Stores `value` as the cached response for `key`."""
+    conn = _get_connection()
+    with _lock:
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, value) VALUES (?, ?)",
+            (key, value),
+        )
+        conn.commit()
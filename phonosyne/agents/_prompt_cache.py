@@ -0,0 +1,150 @@
+"""
+Prompt File Cache for Phonosyne Agents
+
+This module provides a small, process-wide cache for the markdown prompt files
+in `prompts/` that serve as agent instructions.
+
+Key features:
+- `load_prompt`: `functools.lru_cache`-backed reader keyed by resolved path and
+  modification time, so repeat loads (module reloads in tests, repeated agent
+  construction) are served from memory.
+- `read_prompt`: Convenience wrapper that stats the file and calls `load_prompt`,
+  so edits to a prompt file invalidate the cached entry automatically.
+- `PROMPTS_DIR` / `load_agent_prompt`: One place that locates `prompts/` and
+  handles a missing prompt file for every agent module.
+- `compile_template` / `render_template`: `{{name}}` placeholders are split out
+  once per template, so rendering is a single join with no rescanning.
+- `template_fields`: The placeholder names of a template, for load-time checks.
+
+@dependencies
+- `functools`
+- `pathlib`
+- `re`
+
+@notes
+- `read_prompt` raises `FileNotFoundError` if the file is missing; callers decide
+  whether to fall back to a placeholder instruction or to fail hard.
+"""
+
+import functools
+import logging
+import re
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# prompts/ at the project root (phonosyne/agents/ -> phonosyne/ -> project root).
+PROMPTS_DIR = Path(__file__).resolve().parent.parent.parent / "prompts"
+
+_TEMPLATE_VAR_RE = re.compile(r"\{\{(\w+)\}\}")
+
+
+@functools.lru_cache(maxsize=64)
+def load_prompt(path_str: str, mtime_ns: int) -> str:
+    """
+    Reads a prompt file from disk.
+
+    Args:
+        path_str: The resolved, absolute path of the prompt file.
+        mtime_ns: The file's modification time in nanoseconds. Only used as part
+                  of the cache key so that edited files are re-read.
+
+    Returns:
+        The file contents.
+    """
+    with open(path_str, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def read_prompt(path: Path) -> str:
+    """
+    Returns the contents of a prompt file, reading from disk only when the file
+    has not been seen before or has been modified since the last read.
+
+    Args:
+        path: Path to the prompt file.
+
+    Returns:
+        The file contents.
+
+    Raises:
+        FileNotFoundError: If the prompt file does not exist.
+    """
+    resolved = path.resolve()
+    return load_prompt(str(resolved), resolved.stat().st_mtime_ns)
+
+
+def load_agent_prompt(file_name: str, fallback: str | None = None) -> str:
+    """
+    Reads an agent's prompt file from `PROMPTS_DIR` (cached; see `read_prompt`).
+
+    Args:
+        file_name: The prompt file name, e.g. "designer.md".
+        fallback: Instructions to use if the file is missing. If None, a
+                  missing file is an error.
+
+    Returns:
+        The prompt text, or `fallback` if the file is missing.
+
+    Raises:
+        FileNotFoundError: If the file is missing and no fallback was given.
+    """
+    path = PROMPTS_DIR / file_name
+    try:
+        return read_prompt(path)
+    except FileNotFoundError:
+        logger.error("CRITICAL: Prompt file not found at %s.", path)
+        if fallback is None:
+            raise
+        return fallback
+
+
+@functools.lru_cache(maxsize=64)
+def compile_template(text: str) -> tuple[str | tuple[str], ...]:
+    """
+    Splits a prompt template into literal chunks and `{{name}}` placeholders.
+
+    Args:
+        text: The template text.
+
+    Returns:
+        A tuple of parts: literal strings, and 1-tuples holding a placeholder name.
+    """
+    parts = _TEMPLATE_VAR_RE.split(text)
+    # re.split with one capture group alternates literal, name, literal, ...
+    return tuple(part if i % 2 == 0 else (part,) for i, part in enumerate(parts))
+
+
+def template_fields(text: str) -> frozenset[str]:
+    """
+    Returns the names of the `{{name}}` placeholders used in a template.
+
+    Args:
+        text: The template text (compiled once and cached).
+
+    Returns:
+        The set of placeholder names.
+    """
+    return frozenset(
+        part[0] for part in compile_template(text) if isinstance(part, tuple)
+    )
+
+
+def render_template(text: str, **values: str) -> str:
+    """
+    Fills the `{{name}}` placeholders of a prompt template.
+
+    Args:
+        text: The template text (compiled once and cached).
+        **values: Replacement text for each placeholder name.
+
+    Returns:
+        The rendered prompt.
+
+    Raises:
+        KeyError: If the template uses a placeholder missing from `values`.
+    """
+    return "".join(
+        values[part[0]] if isinstance(part, tuple) else part
+        for part in compile_template(text)
+    )
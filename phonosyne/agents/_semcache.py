@@ -0,0 +1,182 @@
+"""
+Semantic LLM Response Cache for Phonosyne Agents
+
+This module extends the exact-match cache in `_llm_cache` to near-identical
+inputs: a rephrased brief ("evolving warm pad" vs "warm evolving pad") or a
+reworded stub is served the response stored for its closest earlier input,
+when the two embeddings are similar enough.
+
+Key features:
+- `designer_key` / `analyzer_key`: Split a call into an exact-match scope
+  (model, instructions and, for stubs, id and duration) and the text compared
+  semantically (the brief, or the stub's seed description).
+- `lookup` / `store`: Async read and write; embedding and the similarity scan
+  run in a worker thread.
+- Embeddings from a local `sentence-transformers` model, stored as float32
+  blobs in SQLite; the top-1 cosine similarity must reach
+  `settings.SEMCACHE_THRESHOLD`.
+
+@dependencies
+- `sentence-transformers` (optional; the cache is disabled without it)
+- `numpy`, `sqlite3`, `hashlib`, `functools`, `threading`, `asyncio`
+- `phonosyne.settings` (for `SEMCACHE_*`)
+- `phonosyne.agents._llm_cache.open_sqlite` (database setup)
+
+@notes
+- Opt-in via `settings.SEMCACHE_ENABLED`, like `LLM_CACHE_ENABLED`: a hit
+  replaces a sampled LLM reply with one written for a different wording.
+- Only validated responses should be stored; callers are responsible for that.
+"""
+
+import asyncio
+import functools
+import hashlib
+import logging
+import sqlite3
+import threading
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from phonosyne import settings
+from phonosyne.agents._llm_cache import open_sqlite
+
+# sentence-transformers is an optional dependency used only when
+# settings.SEMCACHE_ENABLED is set.
+try:
+    from sentence_transformers import SentenceTransformer
+
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+if TYPE_CHECKING:
+    from phonosyne.agents.schemas import SampleStub
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_connection: sqlite3.Connection | None = None
+
+
+def is_enabled() -> bool:
+    """True if the semantic cache is switched on and can embed text."""
+    if not settings.SEMCACHE_ENABLED:
+        return False
+    if not SENTENCE_TRANSFORMERS_AVAILABLE:
+        _warn_unavailable()
+        return False
+    return True
+
+
+@functools.cache
+def _warn_unavailable() -> None:
+    logger.warning(
+        "SEMCACHE_ENABLED is set but sentence-transformers is not installed; "
+        "the semantic cache is disabled"
+    )
+
+
+@functools.cache
+def _get_encoder() -> "SentenceTransformer":
+    return SentenceTransformer(settings.SEMCACHE_EMBEDDING_MODEL)
+
+
+def _embed(text: str) -> np.ndarray:
+    """Returns the unit-length float32 embedding of `text`."""
+    return _get_encoder().encode(
+        text, normalize_embeddings=True, convert_to_numpy=True
+    ).astype(np.float32)
+
+
+def _get_connection() -> sqlite3.Connection:
+    """Opens (once per process) the cache database and ensures the table exists."""
+    global _connection
+    with _lock:
+        if _connection is None:
+            _connection = open_sqlite(
+                settings.SEMCACHE_PATH,
+                "CREATE TABLE IF NOT EXISTS entries "
+                "(scope TEXT NOT NULL, text TEXT NOT NULL, "
+                "embedding BLOB NOT NULL, value TEXT NOT NULL, "
+                "PRIMARY KEY (scope, text))",
+            )
+        return _connection
+
+
+def _scope(*parts: str) -> str:
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+def designer_key(model: str, instructions: str, brief: str) -> tuple[str, str]:
+    """Returns the `(scope, text)` of a DesignerAgent call for `brief`."""
+    return _scope("designer", model, instructions), brief.strip()
+
+
+def analyzer_key(
+    model: str, instructions: str, stub: "SampleStub"
+) -> tuple[str, str]:
+    """
+    Returns the `(scope, text)` of an AnalyzerAgent call for `stub`. The id and
+    duration are part of the exact scope, since the recipe's effect name and
+    duration are derived from them.
+    """
+    scope = _scope("analyzer", model, instructions, stub.id, repr(stub.duration))
+    return scope, stub.seed_description.strip()
+
+
+def _lookup_sync(scope: str, text: str) -> tuple[str, float] | None:
+    conn = _get_connection()
+    with _lock:
+        rows = conn.execute(
+            "SELECT embedding, value FROM entries WHERE scope = ?", (scope,)
+        ).fetchall()
+    if not rows:
+        return None
+    matrix = np.frombuffer(b"".join(row[0] for row in rows), dtype=np.float32)
+    similarities = matrix.reshape(len(rows), -1) @ _embed(text)
+    best = int(np.argmax(similarities))
+    if similarities[best] < settings.SEMCACHE_THRESHOLD:
+        return None
+    return rows[best][1], float(similarities[best])
+
+
+def _store_sync(scope: str, text: str, value: str) -> None:
+    embedding = _embed(text).tobytes()
+    conn = _get_connection()
+    with _lock:
+        conn.execute(
+            "INSERT OR REPLACE INTO entries (scope, text, embedding, value) "
+            "VALUES (?, ?, ?, ?)",
+            (scope, text, embedding, value),
+        )
+        conn.commit()
+
+
+async def lookup(scope: str, text: str, label: str) -> str | None:
+    """
+    Returns the stored response whose text is most similar to `text` within
+    `scope`, if the similarity reaches `settings.SEMCACHE_THRESHOLD`.
+
+    Args:
+        scope: The exact-match scope (see `designer_key` / `analyzer_key`).
+        text: The text compared semantically.
+        label: Names the call in the hit log line.
+    """
+    hit = await asyncio.to_thread(_lookup_sync, scope, text)
+    if hit is None:
+        return None
+    value, similarity = hit
+    # Rough estimate (~4 characters per token) of the reply tokens not generated.
+    logger.info(
+        "Semantic cache hit for %s (similarity=%.3f, tokens_saved~%d)",
+        label,
+        similarity,
+        len(value) // 4,
+    )
+    return value
+
+
+async def store(scope: str, text: str, value: str) -> None:
+    """Stores `value` as the response for `text` within `scope`."""
+    await asyncio.to_thread(_store_sync, scope, text, value)
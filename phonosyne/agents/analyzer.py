@@ -12,6 +12,11 @@ Key features:
 - Instructions are loaded from `prompts/analyzer.md`.
 - Input: `AnalyzerInput` schema (or a JSON string representation of it).
 - Output: `AnalyzerOutput` schema (facilitated by `output_type`).
+- `run_batch`: Expands several stubs per LLM call (`settings.ANALYZER_BATCH_SIZE`).
+- `run_streaming`: Streams a single reply and schedules a callback (e.g.
+  `CompilerAgent.prepare`) once `effect_name`/`duration` have arrived.
+- Optional provider-native structured output (`settings.ANALYZER_STRUCTURED_OUTPUT`)
+  via a strict `response_format=json_schema` passed in `extra_body`.
 - Focuses on enriching a concise idea into a more actionable set of instructions
   for DSP code generation.
 
@@ -19,8 +24,10 @@ Key features:
 - `agents.Agent` (from the new SDK)
 - `phonosyne.agents.schemas.AnalyzerInput`, `phonosyne.agents.schemas.AnalyzerOutput`
 - `phonosyne.settings` (for `MODEL_ANALYZER`, `DEFAULT_SR`)
+- `phonosyne.agents._prompt_cache.load_agent_prompt` (cached prompt file loading)
+- `msgspec` (optional, via `schemas.AnalyzerOutputMsg`), `ijson` (optional)
+- `phonosyne.sdk.OPENROUTER_MODEL_PROVIDER` (for `get_analyzer_agent`)
 - `logging`
-- `pathlib`
 
 @notes
 - The quality of the `description` field in `AnalyzerOutput` is critical for the
@@ -28,39 +35,223 @@ Key features:
 - The prompt (`analyzer.md`) guides the LLM to produce JSON conforming to `AnalyzerOutput`.
 """
 
+import asyncio
+import functools
+import io
 import logging
-from pathlib import Path
-from typing import Any
+import re
+from typing import Any, Awaitable, Callable, List
 
 # Import the new Agent class from the SDK
-from agents import Agent, ModelSettings
-from pydantic import BaseModel, Field  # For AnalyzerInput
+from agents import Agent, ModelSettings, RunConfig, Runner
+from pydantic import (  # For AnalyzerInput
+    BaseModel,
+    Field,
+    TypeAdapter,
+    ValidationError,
+)
 
 from phonosyne import settings
-from phonosyne.agents.schemas import AnalyzerInput, AnalyzerOutput
+from phonosyne.agents import schemas
+from phonosyne.agents._prompt_cache import load_agent_prompt
+from phonosyne.agents.schemas import (
+    AnalyzerInput,
+    AnalyzerOutput,
+    BatchAnalyzerInput,
+    BatchAnalyzerOutput,
+    SampleStub,
+    json_schema_response_format,
+)
+from phonosyne.sdk import (
+    DEFAULT_LOGGING_HOOKS,
+    OPENROUTER_MODEL_PROVIDER,
+    llm_retrying,
+)
+from phonosyne.utils.string_utils import JsonObjectEndScanner, loads_json
 
-# Note: phonosyne.utils.slugify is no longer directly used here.
-# The prompt instructs the LLM to generate a snake_case_slug.
+# ijson is an optional dependency used only when settings.FAST_PARSE is enabled.
+try:
+    import ijson
+
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
 
 # --- Load Instructions ---
-try:
-    PROMPT_FILE_PATH = (
-        Path(__file__).resolve().parent.parent.parent / "prompts" / "analyzer.md"
-    )
-    with open(PROMPT_FILE_PATH, "r", encoding="utf-8") as f:
-        ANALYZER_INSTRUCTIONS = f.read()
-except FileNotFoundError:
-    logger.error(
-        f"CRITICAL: Analyzer prompt file not found at {PROMPT_FILE_PATH}. "
-        "AnalyzerAgent will not function correctly."
-    )
-    ANALYZER_INSTRUCTIONS = (
+ANALYZER_INSTRUCTIONS = load_agent_prompt(
+    "analyzer.md",
+    fallback=(
         "ERROR: Analyzer prompt not loaded. "
         "Your task is to take a sound idea and expand it into a detailed synthesis recipe."
+    ),
+)
+
+
+# Outermost {...} span, for replies that wrap the JSON object in prose or fences.
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+_REQUIRED_OUTPUT_KEYS = frozenset(AnalyzerOutput.model_fields)
+_EDGE_CHARS = frozenset(" \t\r\n\f\v`")
+# Built once: batch replies are either the documented object or a bare array.
+_BATCH_REPLY_ADAPTER: TypeAdapter[BatchAnalyzerOutput | List[AnalyzerOutput]] = (
+    TypeAdapter(BatchAnalyzerOutput | List[AnalyzerOutput])
+)
+# Header fields of a (possibly still streaming) recipe. A number only counts once
+# a delimiter follows it, so a partially streamed "duration": 1 is not read as 1.
+_EFFECT_NAME_RE = re.compile(r'"effect_name"\s*:\s*"((?:[^"\\]|\\.)*)"')
+_DURATION_RE = re.compile(
+    r'"duration"\s*:\s*(-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)\s*[,}]'
+)
+
+
+def _parse_analyzer_output_incremental(text: str) -> AnalyzerOutput | None:
+    """
+    Reads the top-level keys of the reply with `ijson`, stopping as soon as every
+    `AnalyzerOutput` field has been seen, so truncated or overlong replies do not
+    need to parse cleanly to the end.
+
+    Returns:
+        The `AnalyzerOutput`, or None if the required keys could not be read
+        (the caller then falls back to the full-buffer parser).
+    """
+    data: dict[str, object] = {}
+    try:
+        items = ijson.kvitems(io.BytesIO(text.encode()), "", use_float=True)
+        for key, value in items:
+            if key in _REQUIRED_OUTPUT_KEYS:
+                data[key] = value
+                if len(data) == len(_REQUIRED_OUTPUT_KEYS):
+                    break
+    except ijson.JSONError:
+        pass
+    if len(data) != len(_REQUIRED_OUTPUT_KEYS):
+        return None
+
+    already_typed = (
+        isinstance(data["effect_name"], str)
+        and isinstance(data["description"], str)
+        and len(data["description"]) >= 10
+        and isinstance(data["duration"], (int, float))
+        and data["duration"] >= 0.1
     )
+    if already_typed:
+        return AnalyzerOutput.trusted(**data)
+    return AnalyzerOutput.model_validate(data)
+
+
+def _strip_reply(text: str) -> str:
+    """
+    Strips surrounding whitespace and markdown backticks from a reply. Clean
+    JSON replies (the common case) are returned as is, without copying.
+    """
+    if text and text[0] not in _EDGE_CHARS and text[-1] not in _EDGE_CHARS:
+        return text
+    return text.strip().strip("`")
+
+
+def parse_analyzer_output(raw_output: str) -> AnalyzerOutput:
+    """
+    Parses and validates the AnalyzerAgent's raw reply into an `AnalyzerOutput`.
+
+    The reply is decoded and validated in a single pass by pydantic-core
+    (`model_validate_json`), without building an intermediate dict. If the model
+    wrapped the JSON object in markdown fences or commentary, the outermost
+    `{...}` span is extracted and decoded instead. With `settings.FAST_PARSE` enabled (and
+    `ijson` installed), an incremental early-exit parse is tried first. With
+    `settings.MSGSPEC_PARSE` enabled (and `msgspec` installed), clean replies are
+    decoded straight into `AnalyzerOutputMsg` before any other parser runs.
+
+    Args:
+        raw_output: The agent's final output string.
+
+    Returns:
+        The validated `AnalyzerOutput`.
+
+    Raises:
+        ValueError: If no JSON object can be decoded, or if it fails schema
+                    validation (`pydantic.ValidationError` subclasses `ValueError`).
+    """
+    text = _strip_reply(raw_output)
+    if settings.MSGSPEC_PARSE and schemas.MSGSPEC_AVAILABLE:
+        # None for a fenced/prose-wrapped or invalid reply; use the tolerant path.
+        parsed = schemas.AnalyzerOutputMsg.decode(text.encode())
+        if parsed is not None:
+            return parsed
+
+    if settings.FAST_PARSE and IJSON_AVAILABLE:
+        parsed = _parse_analyzer_output_incremental(text)
+        if parsed is not None:
+            return parsed
+
+    try:
+        return AnalyzerOutput.model_validate_json(text)
+    except ValidationError as e:
+        if not _is_json_decode_error(e):
+            raise
+        match = _JSON_OBJECT_RE.search(text)
+        if match is None:
+            raise
+        return AnalyzerOutput.model_validate_json(match.group(0))
+
+
+def _is_json_decode_error(error: ValidationError) -> bool:
+    """True if `model_validate_json` failed on malformed JSON, not on the schema."""
+    return any(detail["type"] == "json_invalid" for detail in error.errors())
+
+
+def parse_batch_analyzer_output(raw_output: str) -> List[AnalyzerOutput]:
+    """
+    Parses a reply to a `BatchAnalyzerInput` into its recipes.
+
+    Accepts the documented `{"items": [...]}` object as well as a bare JSON array
+    of recipes, validated in one pass by a prebuilt `TypeAdapter`. Replies
+    wrapped in fences or commentary fall back to the outermost `{...}` span.
+
+    Raises:
+        ValueError: If the reply cannot be decoded or fails validation.
+    """
+    text = _strip_reply(raw_output)
+    try:
+        parsed = _BATCH_REPLY_ADAPTER.validate_json(text)
+    except ValidationError as e:
+        match = _JSON_OBJECT_RE.search(text)
+        if not _is_json_decode_error(e) or match is None:
+            raise
+        parsed = _BATCH_REPLY_ADAPTER.validate_json(match.group(0))
+    return parsed.items if isinstance(parsed, BatchAnalyzerOutput) else parsed
+
+
+# Constructor defaults shared by every AnalyzerAgent, built once at import.
+# Agents only read these (the model settings are resolved into a new object per
+# run), so one ModelSettings instance can back all of them.
+_ANALYZER_KWARGS: dict[str, Any] = dict(
+    name="PhonosyneAnalyzer_Agent",
+    # The `instructions` are the system prompt for the LLM.
+    # The actual sound stub data (e.g., from AnalyzerInput) will be passed as `input`
+    # to `Runner.run(agent, input=...)`.
+    instructions=ANALYZER_INSTRUCTIONS,
+    # output_type=AnalyzerOutput,  # Temporarily removed to rely on prompt for JSON structure
+    # tools: left to the Agent default (a fresh empty list); the AnalyzerAgent uses none.
+    model_settings=ModelSettings(
+        temperature=0.6,  # Recommended 0.5 to 0.7
+        top_p=0.95,
+        frequency_penalty=0.2,  # Recommended 0.1 to 0.3
+        presence_penalty=0.2,  # Recommended 0.1 to 0.3
+        # Provider-native JSON-schema mode is opt-in: `output_type` was removed for
+        # Gemini/OpenRouter compatibility, and not every routed model supports it.
+        extra_body=(
+            {
+                "response_format": json_schema_response_format(
+                    "AnalyzerOutput", AnalyzerOutput
+                )
+            }
+            if settings.ANALYZER_STRUCTURED_OUTPUT
+            else None
+        ),
+    ),
+)
 
 
 # --- Define Agent ---
@@ -79,30 +270,172 @@ class AnalyzerAgent(Agent):
         Initializes the AnalyzerAgent.
 
         Args:
-            **kwargs: Additional keyword arguments to pass to the `agents.Agent` constructor.
+            **kwargs: Additional keyword arguments to pass to the `agents.Agent` constructor,
+                      overriding the defaults in `_ANALYZER_KWARGS`.
                       The 'model' kwarg can be a model name (str) or a Model instance.
         """
-        agent_name = kwargs.pop("name", "PhonosyneAnalyzer_Agent")
         # The 'model' kwarg will be passed in by OrchestratorAgent.
-        model_arg = kwargs.pop("model", settings.MODEL_ANALYZER)
-
-        # The `instructions` are the system prompt for the LLM.
-        # The actual sound stub data (e.g., from AnalyzerInput) will be passed as `input`
-        # to `Runner.run(agent, input=...)`.
-        super().__init__(
-            name=agent_name,
-            instructions=ANALYZER_INSTRUCTIONS,
-            model=model_arg,  # Pass the model name or Model instance
-            # output_type=AnalyzerOutput,  # Temporarily removed to rely on prompt for JSON structure
-            tools=[],  # AnalyzerAgent itself does not use tools
-            model_settings=ModelSettings(
-                temperature=0.6,  # Recommended 0.5 to 0.7
-                top_p=0.95,
-                frequency_penalty=0.2,  # Recommended 0.1 to 0.3
-                presence_penalty=0.2,  # Recommended 0.1 to 0.3
-            ),
-            **kwargs,
+        kwargs.setdefault("model", settings.MODEL_ANALYZER)
+        super().__init__(**{**_ANALYZER_KWARGS, **kwargs})
+
+    async def run_batch(
+        self,
+        stubs: List[AnalyzerInput],
+        batch_size: int | None = None,
+    ) -> List[AnalyzerOutput | BaseException]:
+        """
+        Expands many stubs using one LLM call per batch instead of one per stub,
+        amortizing the per-request overhead and the repeated system prompt.
+
+        Stubs are grouped into batches of `batch_size`, each batch is sent as a
+        `BatchAnalyzerInput` JSON string, and the batches run concurrently
+        (bounded by `settings.MAX_CONCURRENCY`).
+
+        Each batch is retried on transient errors (and on unparseable or
+        short replies) with the same backoff policy as `analyze_samples`.
+
+        Args:
+            stubs: The analyzer inputs to expand.
+            batch_size: Stubs per LLM call. Defaults to `settings.ANALYZER_BATCH_SIZE`.
+
+        Returns:
+            A list aligned with `stubs`, holding either the stub's `AnalyzerOutput`
+            or the exception its batch failed with (e.g. a `ValueError` when the
+            reply never held exactly one recipe per stub), so one bad batch does
+            not discard the others.
+        """
+        size = batch_size or settings.ANALYZER_BATCH_SIZE
+        batches = [stubs[i : i + size] for i in range(0, len(stubs), size)]
+        run_config = RunConfig(model_provider=OPENROUTER_MODEL_PROVIDER)
+        if settings.ANALYZER_STRUCTURED_OUTPUT:
+            run_config.model_settings = ModelSettings(
+                extra_body={
+                    "response_format": json_schema_response_format(
+                        "BatchAnalyzerOutput", BatchAnalyzerOutput
+                    )
+                }
+            )
+        semaphore = asyncio.Semaphore(settings.MAX_CONCURRENCY)
+
+        async def _run_one(batch: List[AnalyzerInput]) -> List[AnalyzerOutput]:
+            input_str = BatchAnalyzerInput(items=batch).transport_json()
+            async for attempt in llm_retrying():
+                with attempt:
+                    async with semaphore:
+                        result = await Runner.run(
+                            starting_agent=self,
+                            input=input_str,
+                            run_config=run_config,
+                            hooks=DEFAULT_LOGGING_HOOKS,
+                        )
+                    recipes = parse_batch_analyzer_output(str(result.final_output))
+                    if len(recipes) != len(batch):
+                        raise ValueError(
+                            f"Analyzer batch returned {len(recipes)} recipes for {len(batch)} stubs."
+                        )
+            return recipes
+
+        results = await asyncio.gather(
+            *map(_run_one, batches), return_exceptions=True
         )
+        outputs: List[AnalyzerOutput | BaseException] = []
+        for batch, batch_result in zip(batches, results):
+            if isinstance(batch_result, BaseException):
+                outputs.extend([batch_result] * len(batch))
+            else:
+                outputs.extend(batch_result)
+        return outputs
+
+    async def run_streaming(
+        self,
+        stub: AnalyzerInput | SampleStub,
+        on_header: Callable[[str, float], Awaitable[Any]] | None = None,
+    ) -> tuple[AnalyzerOutput, Any]:
+        """
+        Expands one stub while streaming the reply, so downstream work can start
+        before the long `description` field has finished generating.
+
+        As soon as `effect_name` and `duration` have streamed in, `on_header` is
+        scheduled as a task (e.g. `CompilerAgent.prepare`) and runs concurrently
+        with the remainder of the reply. Once the top-level JSON object closes,
+        the stream is cancelled instead of waiting for any trailing text.
+
+        Args:
+            stub: The analyzer input to expand.
+            on_header: Optional coroutine function called with the streamed
+                       `effect_name` and `duration`.
+
+        Returns:
+            A tuple of the validated `AnalyzerOutput` and the result of
+            `on_header` (None if it was not given or the header never appeared).
+
+        Raises:
+            ValueError: If the final reply cannot be parsed into an `AnalyzerOutput`.
+        """
+        result = Runner.run_streamed(
+            starting_agent=self,
+            input=stub.transport_json(),
+            run_config=RunConfig(model_provider=OPENROUTER_MODEL_PROVIDER),
+            hooks=DEFAULT_LOGGING_HOOKS,
+        )
+        header_task: asyncio.Task | None = None
+        chunks: list[str] = []
+        # Text streamed so far, kept only while the header is still pending. It is
+        # extended in place instead of re-joining every chunk on each delta.
+        header_text = ""
+        scanner = JsonObjectEndScanner()
+        closed = False
+        try:
+            async for event in result.stream_events():
+                if event.type != "raw_response_event":
+                    continue
+                if getattr(event.data, "type", None) != "response.output_text.delta":
+                    continue
+                chunks.append(event.data.delta)
+                if header_task is None and on_header is not None:
+                    header_text += event.data.delta
+                    name_match = _EFFECT_NAME_RE.search(header_text)
+                    duration_match = _DURATION_RE.search(header_text)
+                    if name_match and duration_match:
+                        header_text = ""
+                        header_task = asyncio.create_task(
+                            on_header(
+                                loads_json(f'"{name_match.group(1)}"'),
+                                float(duration_match.group(1)),
+                            )
+                        )
+                if scanner.feed(event.data.delta):
+                    # The recipe object is complete; stop paying for trailing tokens.
+                    closed = True
+                    result.cancel()
+                    break
+            raw = "".join(chunks) if closed else str(result.final_output)
+            output = parse_analyzer_output(raw)
+        except BaseException:
+            if header_task is not None:
+                header_task.cancel()
+            raise
+        header_result = await header_task if header_task is not None else None
+        return output, header_result
+
+
+@functools.lru_cache(maxsize=8)
+def get_analyzer_agent(model_name: str = settings.MODEL_ANALYZER) -> AnalyzerAgent:
+    """
+    Returns a process-wide AnalyzerAgent for the given model name.
+
+    The agent is built once per model with a `Model` instance from
+    `OPENROUTER_MODEL_PROVIDER` and then reused. `agents.Agent` only holds
+    configuration (all per-run state lives in `Runner.run`), so a single instance
+    can safely serve concurrent runs.
+
+    Args:
+        model_name: The OpenRouter model identifier to use.
+
+    Returns:
+        The shared AnalyzerAgent for `model_name`.
+    """
+    return AnalyzerAgent(model=OPENROUTER_MODEL_PROVIDER.get_model(model_name))
 
 
 # Note: The old `if __name__ == "__main__":` block has been removed.
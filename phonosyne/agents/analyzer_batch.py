@@ -0,0 +1,169 @@
+"""
+Batch API Path for the Analyzer Stage
+
+This module runs the AnalyzerAgent's prompt over many sample stubs through
+OpenAI's Batch API instead of one live chat completion per stub. Batch jobs
+are billed at about half the price of live calls but may take much longer to
+finish, so this path is opt-in.
+
+Key features:
+- `analyze_batch`: builds one JSONL of chat-completion requests (one per stub,
+  `custom_id` = stub id), uploads it, creates the batch, polls it until it
+  finishes and parses every reply back into an `AnalyzerOutput`.
+- `batch_api_available`: whether the batch path can serve a plan of a given size.
+
+@dependencies
+- `openai.AsyncOpenAI` (Files and Batches endpoints)
+- `phonosyne.agents.analyzer` (instructions, sampling settings, reply parser)
+- `phonosyne.agents.schemas.SampleStub`, `AnalyzerOutput`
+- `phonosyne.settings` (`ANALYZER_BATCH_API`, `BATCH_THRESHOLD`, poll interval, model)
+- `phonosyne.utils.string_utils` (JSON helpers)
+- `asyncio`, `functools`, `logging`
+
+@notes
+- OpenRouter does not expose the Batch API, so requests go straight to OpenAI
+  with `settings.OPENAI_API_KEY`; only `openai/...` analyzer models qualify.
+- Stubs whose request fails or whose reply does not parse are returned as
+  exceptions, so the caller can re-run them through the live path.
+"""
+
+import asyncio
+import functools
+import logging
+from typing import List, Sequence
+
+from openai import AsyncOpenAI
+
+from phonosyne import settings
+from phonosyne.agents.analyzer import (
+    ANALYZER_INSTRUCTIONS,
+    get_analyzer_agent,
+    parse_analyzer_output,
+)
+from phonosyne.agents.schemas import AnalyzerOutput, SampleStub
+from phonosyne.utils.string_utils import dumps_json, loads_json
+
+logger = logging.getLogger(__name__)
+
+_OPENAI_MODEL_PREFIX = "openai/"
+_BATCH_ENDPOINT = "/v1/chat/completions"
+_FINAL_BATCH_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+def batch_api_available(sample_count: int) -> bool:
+    """
+    Returns True if `sample_count` stubs should be analyzed via the Batch API:
+    the path is enabled, the plan is large enough, an OpenAI key is configured
+    and the analyzer model is an OpenAI model.
+    """
+    return (
+        settings.ANALYZER_BATCH_API
+        and sample_count >= settings.BATCH_THRESHOLD
+        and bool(settings.OPENAI_API_KEY)
+        and settings.MODEL_ANALYZER.startswith(_OPENAI_MODEL_PREFIX)
+    )
+
+
+@functools.cache
+def _get_openai_client() -> AsyncOpenAI:
+    return AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+
+
+def _build_requests(stubs: Sequence[SampleStub]) -> bytes:
+    """Builds the batch input file: one chat-completion request per stub."""
+    model_settings = get_analyzer_agent(settings.MODEL_ANALYZER).model_settings
+    model = settings.MODEL_ANALYZER.removeprefix(_OPENAI_MODEL_PREFIX)
+    lines = []
+    for stub in stubs:
+        body = {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": ANALYZER_INSTRUCTIONS},
+                {"role": "user", "content": stub.transport_json()},
+            ],
+            "temperature": model_settings.temperature,
+            "top_p": model_settings.top_p,
+            "frequency_penalty": model_settings.frequency_penalty,
+            "presence_penalty": model_settings.presence_penalty,
+        }
+        request = {
+            "custom_id": stub.id,
+            "method": "POST",
+            "url": _BATCH_ENDPOINT,
+            "body": body,
+        }
+        lines.append(dumps_json(request))
+    return ("\n".join(lines) + "\n").encode()
+
+
+def _parse_results(
+    text: str, stubs: Sequence[SampleStub]
+) -> List[AnalyzerOutput | BaseException]:
+    """Maps the batch output file back onto `stubs`, in order."""
+    outputs: dict[str, AnalyzerOutput | BaseException] = {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        record = loads_json(line)
+        custom_id = record.get("custom_id")
+        try:
+            response = record.get("response") or {}
+            if record.get("error") or response.get("status_code") != 200:
+                raise RuntimeError(
+                    f"Batch request failed: {record.get('error') or response.get('body')}"
+                )
+            content = response["body"]["choices"][0]["message"]["content"]
+            outputs[custom_id] = parse_analyzer_output(content)
+        except Exception as e:
+            outputs[custom_id] = e
+    return [
+        outputs.get(stub.id, RuntimeError(f"No batch result for sample {stub.id}"))
+        for stub in stubs
+    ]
+
+
+async def analyze_batch(
+    stubs: Sequence[SampleStub],
+) -> List[AnalyzerOutput | BaseException]:
+    """
+    Analyzes `stubs` through a single OpenAI Batch API job.
+
+    Args:
+        stubs: The sample stubs to analyze. Their ids must be unique.
+
+    Returns:
+        A list aligned with `stubs`, holding either the parsed `AnalyzerOutput`
+        or the exception for that stub.
+
+    Raises:
+        RuntimeError: If the batch job itself fails, expires or is cancelled.
+    """
+    client = _get_openai_client()
+    input_file = await client.files.create(
+        file=("analyzer_batch.jsonl", _build_requests(stubs)), purpose="batch"
+    )
+    batch = await client.batches.create(
+        input_file_id=input_file.id,
+        endpoint=_BATCH_ENDPOINT,
+        completion_window="24h",
+    )
+    logger.info("Submitted analyzer batch %s with %d requests", batch.id, len(stubs))
+
+    while batch.status not in _FINAL_BATCH_STATUSES:
+        await asyncio.sleep(settings.ANALYZER_BATCH_POLL_SECONDS)
+        batch = await client.batches.retrieve(batch.id)
+        logger.debug("Analyzer batch %s status: %s", batch.id, batch.status)
+
+    if batch.status != "completed" or not batch.output_file_id:
+        raise RuntimeError(f"Analyzer batch {batch.id} ended with status {batch.status}")
+
+    content = await client.files.content(batch.output_file_id)
+    results = _parse_results(content.text, stubs)
+    failed = sum(isinstance(result, BaseException) for result in results)
+    logger.info(
+        "Analyzer batch %s completed: %d ok, %d failed",
+        batch.id,
+        len(results) - failed,
+        failed,
+    )
+    return results
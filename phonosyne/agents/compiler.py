@@ -9,10 +9,13 @@ refine the code if errors occur. This version is refactored for the `agents` SDK
 
 Key features:
 - Inherits from `agents.Agent`.
-- Instructions are loaded from `prompts/compiler.md`.
+- Instructions are loaded from `prompts/compiler.md` on first use.
 - Input: `AnalyzerOutput` schema (as a JSON string).
 - Output: Path to a validated temporary .wav file (as a string).
 - Uses `PythonCodeExecutionTool` and `AudioValidationTool`.
+- `prepare`: Output scaffolding that can run while the analyzer is still streaming.
+- `compiler_input`: Builds the JSON task input for one recipe and output path,
+  shared by the agent runners in `phonosyne.pipeline`.
 - The iterative loop for code generation, execution, validation, and repair
   is guided by its instructions and managed by the `agents` SDK.
 
@@ -22,8 +25,11 @@ Key features:
 - `phonosyne.settings` (for `MODEL_COMPILER`)
 - `phonosyne.tools.execute_python_dsp_code` (as PythonCodeExecutionTool)
 - `phonosyne.tools.validate_audio_file` (as AudioValidationTool)
+- `phonosyne.agents._prompt_cache.load_agent_prompt` (cached prompt file loading)
+- `functools`
 - `logging`
 - `pathlib`
+- `uuid`
 
 @notes
 - The effectiveness of the iterative repair loop depends heavily on the quality
@@ -31,35 +37,100 @@ Key features:
   use the provided tools and feedback.
 """
 
+import functools
 import logging
+import uuid
 from pathlib import Path
 from typing import Any
 
 # Import the new Agent class from the SDK
-from agents import (
-    Agent,
-    ModelSettings,
-)
+from agents import Agent, ModelSettings
 
 from phonosyne import settings
+from phonosyne.agents._prompt_cache import (
+    PROMPTS_DIR,
+    load_agent_prompt,
+    render_template,
+    template_fields,
+)
 from phonosyne.agents.schemas import AnalyzerOutput  # Conceptual input schema
+from phonosyne.sdk import OPENROUTER_MODEL_PROVIDER
 from phonosyne.tools import run_supercollider_code, validate_audio_file
+from phonosyne.utils.string_utils import dumps_json
 
 logger = logging.getLogger(__name__)
 
 # --- Load Instructions ---
-try:
-    PROMPT_FILE_PATH = (
-        Path(__file__).resolve().parent.parent.parent / "prompts" / "compiler.md"
-    )
-    with open(PROMPT_FILE_PATH, "r", encoding="utf-8") as f:
-        COMPILER_INSTRUCTIONS = f.read()
-except FileNotFoundError:
-    logger.error(
-        f"CRITICAL: Compiler prompt file not found at {PROMPT_FILE_PATH}. "
-        "CompilerAgent will not function correctly."
+PROMPT_FILE_PATH = PROMPTS_DIR / "compiler.md"
+
+
+@functools.cache
+def _get_compiler_instructions() -> str:
+    """
+    Reads and renders `prompts/compiler.md` on first use, rather than at import,
+    so runs that never build a CompilerAgent skip the (large) prompt file.
+
+    Raises:
+        FileNotFoundError: If the prompt file does not exist.
+        ValueError: If the prompt lacks the `{{output_dir}}` placeholder; the
+                    rendered instructions must tell the model where to write.
+    """
+    template = load_agent_prompt(PROMPT_FILE_PATH.name)
+    if "output_dir" not in template_fields(template):
+        raise ValueError(
+            f"Compiler prompt {PROMPT_FILE_PATH} is missing the {{{{output_dir}}}} placeholder."
+        )
+    return render_template(template, output_dir=str(settings.DEFAULT_OUT_DIR))
+
+
+# Temporary directory the compiler writes attempt .wav files to (see compiler.md).
+EXEC_ENV_OUTPUT_DIR = Path(settings.DEFAULT_OUT_DIR).resolve() / "exec_env_output"
+
+
+def wip_wav_path(effect_name: str) -> Path:
+    """
+    A fresh work-in-progress output path for one compilation of an effect, as
+    `prompts/compiler.md` names it. Every attempt of that compilation renders
+    over the same file, so failed attempts leave nothing behind. The random tag
+    keeps samples compiled concurrently (in this run or another) from rendering
+    over, or unlinking, each other's file when their effect names collide.
+    """
+    stem = effect_name.replace(" ", "_")[:40]
+    return EXEC_ENV_OUTPUT_DIR / f"{stem}.{uuid.uuid4().hex[:8]}.wip.wav"
+
+
+def compiler_input(recipe: AnalyzerOutput, output_path: Path) -> str:
+    """
+    Builds the single-recipe input described in `prompts/compiler.md`, with
+    the `output_path` (see `wip_wav_path`) every attempt must render to.
+    """
+    return dumps_json(
+        {
+            "recipe_json": recipe.transport_dict(),
+            "output_dir_context": str(settings.DEFAULT_OUT_DIR),
+            "output_path": str(output_path),
+        }
     )
-    raise FileNotFoundError("Compiler prompt file not found.")
+
+
+# Constructor defaults shared by every CompilerAgent, built once at import.
+# Agents only read these (the SDK copies `tools` into a new list per turn and
+# resolves the model settings into a new object per run).
+_COMPILER_KWARGS: dict[str, Any] = dict(
+    name="PhonosyneCompiler_Agent",
+    # The tools available to this agent
+    tools=[
+        run_supercollider_code,
+        validate_audio_file,
+    ],
+    output_type=str,  # Expects a string (file path) as the final output
+    model_settings=ModelSettings(
+        temperature=0.3,  # Recommended 0.2 to 0.4
+        top_p=0.9,
+        frequency_penalty=0.0,
+        presence_penalty=0.0,
+    ),
+)
 
 
 # --- Define Agent ---
@@ -76,37 +147,50 @@ class CompilerAgent(Agent):
         Initializes the CompilerAgent.
 
         Args:
-            **kwargs: Additional keyword arguments to pass to the `agents.Agent` constructor.
+            **kwargs: Additional keyword arguments to pass to the `agents.Agent` constructor,
+                      overriding the defaults in `_COMPILER_KWARGS`.
                       The 'model' kwarg can be a model name (str) or a Model instance.
         """
-        agent_name = kwargs.pop("name", "PhonosyneCompiler_Agent")  # Updated agent name
         # The 'model' kwarg will be passed in by OrchestratorAgent.
-        model_arg = kwargs.pop("model", settings.MODEL_COMPILER)
-        logger.info(f"CompilerAgent initializing with model_arg: {model_arg!r}")
+        kwargs.setdefault("model", settings.MODEL_COMPILER)
+        logger.info("CompilerAgent initializing with model_arg: %r", kwargs["model"])
+        # Instructions should now guide the generation of SuperCollider code
+        # and usage of run_supercollider_code tool. Rendered once per process
+        # (on first use, so a broken prompt file fails here, not at import).
+        kwargs.setdefault("instructions", _get_compiler_instructions())
+        super().__init__(**{**_COMPILER_KWARGS, **kwargs})
+
+    @staticmethod
+    async def prepare(effect_name: str, duration: float) -> Path:
+        """
+        Sets up what the compiler needs for a recipe before the full recipe is
+        available: ensures the execution output directory exists and returns
+        a fresh output path for the compilation (see `wip_wav_path`).
 
-        # The tools available to this agent
-        agent_tools = [
-            run_supercollider_code,
-            validate_audio_file,
-        ]
+        Intended as the `on_header` callback of `AnalyzerAgent.run_streaming`.
 
-        logger.info("Output directory for CompilerAgent: %s", settings.DEFAULT_OUT_DIR)
-        # Instructions should now guide the generation of SuperCollider code
-        # and usage of run_supercollider_code tool.
-        # The prompt file prompts/compiler.md is assumed to be updated accordingly.
-        instructions = f"{COMPILER_INSTRUCTIONS}\\n\\n## Output Directory\\n\\nOutput files to be saved in: {settings.DEFAULT_OUT_DIR}\\n"
-
-        super().__init__(
-            name=agent_name,
-            instructions=instructions,
-            model=model_arg,  # Pass the model name or Model instance
-            tools=agent_tools,
-            output_type=str,  # Expects a string (file path) as the final output
-            model_settings=ModelSettings(
-                temperature=0.3,  # Recommended 0.2 to 0.4
-                top_p=0.9,
-                frequency_penalty=0.0,
-                presence_penalty=0.0,
-            ),
-            **kwargs,
+        Args:
+            effect_name: The recipe's effect name.
+            duration: The recipe's duration in seconds (validated later).
+
+        Returns:
+            Absolute path of the effect's work-in-progress `.wav` file.
+        """
+        EXEC_ENV_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+        return wip_wav_path(effect_name)
+
+
+@functools.lru_cache(maxsize=8)
+def get_compiler_agent(model_name: str = settings.MODEL_COMPILER) -> CompilerAgent:
+    """
+    Returns a process-wide CompilerAgent for the given model name (see
+    `get_analyzer_agent`). Its model caches the recipe prefix and resends only
+    the latest repair rounds (`settings.COMPILER_HISTORY_ROUNDS`).
+    """
+    return CompilerAgent(
+        model=OPENROUTER_MODEL_PROVIDER.get_model(
+            model_name,
+            cache_input_prefix=True,
+            max_history_rounds=settings.COMPILER_HISTORY_ROUNDS,
         )
+    )
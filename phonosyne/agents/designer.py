@@ -9,24 +9,28 @@ Key features:
 - Inherits from `agents.Agent`.
 - Instructions are loaded from `prompts/designer.md`.
 - Takes a user brief (string) as input when run.
-- Outputs a JSON object conforming to the `DesignerOutput` Pydantic schema,
-  facilitated by the `output_type` parameter of `agents.Agent`.
+- Outputs a JSON object conforming to the `DesignerOutput` Pydantic schema.
+- `parse_designer_output`: validates a reply into a `DesignerOutput` in one pass.
+- Optional provider-native structured output (`settings.DESIGNER_STRUCTURED_OUTPUT`)
+  via a strict `response_format=json_schema` passed in `extra_body`.
 
 @dependencies
 - `agents.Agent` (from the new SDK)
 - `phonosyne.agents.schemas.DesignerOutput` (for output validation)
 - `phonosyne.agents.schemas.DesignerAgentInput` (for input clarity)
 - `phonosyne.settings` (for `MODEL_DESIGNER`)
+- `phonosyne.agents._prompt_cache.load_agent_prompt` (cached prompt file loading)
+- `phonosyne.sdk.OPENROUTER_MODEL_PROVIDER` (for `get_designer_agent`)
+- `phonosyne.utils.string_utils.extract_code_block`
 - `logging`
-- `pathlib`
 
 @notes
 - The agent's core execution logic (LLM calls, output parsing) is handled by the SDK.
 - The prompt template (`designer.md`) is crucial for guiding the LLM.
 """
 
+import functools
 import logging
-from pathlib import Path
 from typing import Any
 
 # Import the new Agent class from the SDK
@@ -34,7 +38,10 @@ from agents import Agent, ModelSettings
 from pydantic import BaseModel, Field  # Retaining for DesignerAgentInput
 
 from phonosyne import settings
-from phonosyne.agents.schemas import DesignerOutput
+from phonosyne.agents._prompt_cache import load_agent_prompt
+from phonosyne.agents.schemas import DesignerOutput, json_schema_response_format
+from phonosyne.sdk import OPENROUTER_MODEL_PROVIDER
+from phonosyne.utils.string_utils import extract_code_block
 
 logger = logging.getLogger(__name__)
 
@@ -51,23 +58,68 @@ class DesignerAgentInput(BaseModel):
 
 
 # --- Load Instructions ---
-# Assuming this file is phonosyne/agents/designer.py
-# Project root is three levels up from this file's directory.
-# phonosyne/agents/designer.py -> phonosyne/agents/ -> phonosyne/ -> project_root/
-try:
-    PROMPT_FILE_PATH = (
-        Path(__file__).resolve().parent.parent.parent / "prompts" / "designer.md"
-    )
-    with open(PROMPT_FILE_PATH, "r", encoding="utf-8") as f:
-        DESIGNER_INSTRUCTIONS = f.read()
-except FileNotFoundError:
-    logger.error(
-        f"CRITICAL: Designer prompt file not found at {PROMPT_FILE_PATH}. "
-        "DesignerAgent will not function correctly."
-    )
-    DESIGNER_INSTRUCTIONS = (
+DESIGNER_INSTRUCTIONS = load_agent_prompt(
+    "designer.md",
+    fallback=(
         "ERROR: Designer prompt not loaded. "
         "Your task is to take a user brief and expand it into a detailed sound design plan."
+    ),
+)
+
+
+# Constructor defaults shared by every DesignerAgent, built once at import.
+# Agents only read these (the model settings are resolved into a new object per
+# run), so one ModelSettings instance can back all of them.
+_DESIGNER_KWARGS: dict[str, Any] = dict(
+    name="PhonosyneDesigner_Agent",
+    # The `instructions` are the system prompt for the LLM.
+    # The `user_brief` will be passed as the `input` when `Runner.run(agent, input=user_brief)` is called.
+    instructions=DESIGNER_INSTRUCTIONS,
+    # output_type=DesignerOutput, # Temporarily removed to rely on prompt for JSON structure
+    # tools: left to the Agent default (a fresh empty list); the DesignerAgent uses none.
+    model_settings=ModelSettings(
+        temperature=0.7,  # Recommended 0.6 to 0.8
+        top_p=0.9,
+        # Bounded near the size of a full 24-sample plan; a truncated
+        # plan is retried with a larger cap (see the orchestrator's tool).
+        max_tokens=settings.DESIGNER_MAX_TOKENS,
+        frequency_penalty=0.35,  # Recommended 0.2 to 0.5
+        presence_penalty=0.35,  # Recommended 0.2 to 0.5
+        # Provider-native JSON-schema mode is opt-in, as for the AnalyzerAgent:
+        # not every OpenRouter-routed model supports it.
+        extra_body=(
+            {
+                "response_format": json_schema_response_format(
+                    "DesignerOutput", DesignerOutput
+                )
+            }
+            if settings.DESIGNER_STRUCTURED_OUTPUT
+            else None
+        ),
+    ),
+)
+
+
+def parse_designer_output(raw_output: str) -> DesignerOutput:
+    """
+    Parses and validates the DesignerAgent's raw reply into a `DesignerOutput`.
+
+    A surrounding markdown fence is stripped without decoding, so the plan is
+    decoded and validated in a single pydantic-core pass (`model_validate_json`)
+    straight into the model, with no intermediate dict.
+
+    Args:
+        raw_output: The agent's final output string.
+
+    Returns:
+        The validated `DesignerOutput`.
+
+    Raises:
+        ValueError: If the reply is not valid JSON or fails schema validation
+                    (`pydantic.ValidationError` subclasses `ValueError`).
+    """
+    return DesignerOutput.model_validate_json(
+        extract_code_block(raw_output) or raw_output.strip()
     )
 
 
@@ -86,32 +138,24 @@ class DesignerAgent(Agent):
         Initializes the DesignerAgent.
 
         Args:
-            **kwargs: Additional keyword arguments to pass to the `agents.Agent` constructor.
+            **kwargs: Additional keyword arguments to pass to the `agents.Agent` constructor,
+                      overriding the defaults in `_DESIGNER_KWARGS`.
                       The 'model' kwarg can be a model name (str) or a Model instance.
         """
-        # Default configuration for the DesignerAgent instance
-        agent_name = kwargs.pop("name", "PhonosyneDesigner_Agent")
         # The 'model' kwarg will be passed in by OrchestratorAgent.
-        # If not passed, it would default here, but we want Orchestrator to control it.
         # Defaulting to settings.MODEL_DESIGNER if 'model' is not in kwargs.
-        model_arg = kwargs.pop("model", settings.MODEL_DESIGNER)
-
-        # The `instructions` are the system prompt for the LLM.
-        # The `user_brief` will be passed as the `input` when `Runner.run(agent, input=user_brief)` is called.
-        super().__init__(
-            name=agent_name,
-            instructions=DESIGNER_INSTRUCTIONS,
-            model=model_arg,  # Pass the model name or Model instance
-            # output_type=DesignerOutput, # Temporarily removed to rely on prompt for JSON structure
-            tools=[],  # DesignerAgent itself does not use tools
-            model_settings=ModelSettings(
-                temperature=0.7,  # Recommended 0.6 to 0.8
-                top_p=0.95,
-                frequency_penalty=0.35,  # Recommended 0.2 to 0.5
-                presence_penalty=0.35,  # Recommended 0.2 to 0.5
-            ),
-            **kwargs,  # Pass through any other agent parameters
-        )
+        kwargs.setdefault("model", settings.MODEL_DESIGNER)
+        super().__init__(**{**_DESIGNER_KWARGS, **kwargs})
+
+
+@functools.lru_cache(maxsize=8)
+def get_designer_agent(model_name: str = settings.MODEL_DESIGNER) -> DesignerAgent:
+    """
+    Returns a process-wide DesignerAgent for the given model name, built once
+    with a `Model` instance from `OPENROUTER_MODEL_PROVIDER` (see
+    `get_analyzer_agent`).
+    """
+    return DesignerAgent(model=OPENROUTER_MODEL_PROVIDER.get_model(model_name))
 
 
 # Note: The old `if __name__ == "__main__":` block has been removed.
@@ -14,12 +14,15 @@ Key features:
 
 @dependencies
 - `agents.Agent` (from the new SDK)
-- `phonosyne.agents.designer.DesignerAgent`
-- `phonosyne.agents.analyzer.AnalyzerAgent`
-- `phonosyne.agents.compiler.CompilerAgent`
+- `phonosyne.agents.designer.get_designer_agent` (shared DesignerAgent instance)
+- `phonosyne.agents.analyzer.get_analyzer_agent` (shared AnalyzerAgent instance)
+- `phonosyne.agents.compiler.get_compiler_agent` (shared CompilerAgent instance)
 - `phonosyne.tools.move_file` (as FileMoverTool)
 - `phonosyne.tools.generate_manifest_file` (as ManifestGeneratorTool)
 - `phonosyne.settings` (for `MODEL_ORCHESTRATOR` or a default model)
+- `phonosyne.agents._prompt_cache.read_prompt` (cached prompt file loading)
+- `phonosyne.agents._llm_cache` (opt-in response cache for the Designer/Analyzer tools)
+- `phonosyne.agents._semcache` (opt-in semantic cache for the same tools)
 - `logging`
 - `pathlib`
 
@@ -28,44 +31,233 @@ Key features:
 - Error handling and state management across tool calls are crucial for robustness.
 """
 
+import functools
 import logging
 from pathlib import Path
-from typing import Any, List
+from typing import Any, Callable, List
 
 # Import the new Agent class from the SDK
-from agents import Agent, ModelSettings
+from agents import (
+    Agent,
+    FunctionTool,
+    ItemHelpers,
+    ModelSettings,
+    RunConfig,
+    RunContextWrapper,
+    Runner,
+    function_tool,
+)
 
 from phonosyne import settings
-from phonosyne.agents.analyzer import AnalyzerAgent
-from phonosyne.agents.compiler import CompilerAgent
-from phonosyne.agents.designer import DesignerAgent
+from phonosyne.agents import _llm_cache, _semcache
+from phonosyne.agents._prompt_cache import PROMPTS_DIR, read_prompt
+from phonosyne.agents.analyzer import (
+    ANALYZER_INSTRUCTIONS,
+    get_analyzer_agent,
+    parse_analyzer_output,
+)
+from phonosyne.agents.compiler import get_compiler_agent
+from phonosyne.agents.designer import (
+    DESIGNER_INSTRUCTIONS,
+    get_designer_agent,
+    parse_designer_output,
+)
 
 # Schemas might be needed for parsing outputs if not automatically handled by output_type of sub-agents
-from phonosyne.agents.schemas import AnalyzerOutput, DesignerOutput
+from phonosyne.agents.schemas import SampleStub
 from phonosyne.sdk import OPENROUTER_MODEL_PROVIDER  # Import our model provider
 from phonosyne.tools import generate_manifest_file, move_file
+from phonosyne.utils.string_utils import JsonObjectEndScanner, extract_code_block
 
 logger = logging.getLogger(__name__)
 
 
 # Function to load instructions from a file
 def load_instructions_from_file(file_path: Path) -> str:
-    """Loads agent instructions from a markdown file."""
+    """Loads agent instructions from a markdown file (cached; see `read_prompt`)."""
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            return f.read()
+        return read_prompt(file_path)
     except FileNotFoundError:
-        logger.error(f"Instruction file not found: {file_path}")
+        logger.error("Instruction file not found: %s", file_path)
         # Fallback or raise an error, depending on desired behavior
         return "Default instructions: Orchestrate the Phonosyne pipeline."
     except Exception as e:
-        logger.error(f"Error loading instructions from {file_path}: {e}")
+        logger.error("Error loading instructions from %s: %s", file_path, e)
         return "Error loading instructions."
 
 
-# Determine the absolute path to the prompts directory
-# Assuming this script is in phonosyne/agents/ and prompts is at phonosyne/../prompts/
-PROMPTS_DIR = Path(__file__).resolve().parent.parent.parent / "prompts"
+async def _stream_json_reply(
+    agent: Agent, input: str, context: Any, run_config: RunConfig | None = None
+) -> tuple[str, bool]:
+    """
+    Runs `agent` with a streamed reply and cancels the stream as soon as the
+    top-level JSON object closes.
+
+    Returns:
+        The reply text and whether a complete JSON object was seen.
+    """
+    result = Runner.run_streamed(
+        starting_agent=agent, input=input, context=context, run_config=run_config
+    )
+    chunks: list[str] = []
+    scanner = JsonObjectEndScanner()
+    async for event in result.stream_events():
+        if event.type != "raw_response_event":
+            continue
+        if getattr(event.data, "type", None) != "response.output_text.delta":
+            continue
+        chunks.append(event.data.delta)
+        if scanner.feed(event.data.delta):
+            result.cancel()
+            return "".join(chunks), True
+    return ItemHelpers.text_message_outputs(result.new_items), False
+
+
+def _cached_agent_tool(
+    agent: Agent,
+    model_name: str,
+    tool_name: str,
+    tool_description: str,
+    validate: Callable[[str], Any],
+    semantic_key: Callable[[str], tuple[str, str] | None] | None = None,
+) -> FunctionTool:
+    """
+    Like `agent.as_tool(...)`, for agents whose reply is a single JSON object:
+
+    - The reply is streamed and the stream is cancelled as soon as the
+      top-level object closes, so tokens the model appends after the JSON
+      (commentary, fences) are never generated.
+    - If the agent has a `max_tokens` cap and the object never closes (a
+      truncated reply), the call is retried once with double the cap.
+    - When `settings.LLM_CACHE_ENABLED` is set, the reply is served from and
+      stored in the on-disk LLM response cache, keyed by model, instructions
+      and tool input. Replies are only stored once `validate` accepts them, so
+      a malformed reply is never replayed.
+    - When `settings.SEMCACHE_ENABLED` is set and `semantic_key` maps the input
+      to a `(scope, text)` pair (see `_semcache`), a reply stored for a
+      near-identical input is served, and validated replies are stored.
+    """
+
+    @function_tool(name_override=tool_name, description_override=tool_description)
+    async def run_agent(context: RunContextWrapper, input: str) -> str:
+        cache_key = None
+        if settings.LLM_CACHE_ENABLED and isinstance(agent.instructions, str):
+            cache_key = _llm_cache.make_key(model_name, agent.instructions, input)
+            cached_output = _llm_cache.get(cache_key)
+            if cached_output is not None:
+                logger.info("LLM cache hit for %s", tool_name)
+                return cached_output
+        semantic = None
+        if semantic_key is not None and _semcache.is_enabled():
+            semantic = semantic_key(input)
+            if semantic is not None:
+                cached_output = await _semcache.lookup(*semantic, tool_name)
+                if cached_output is not None:
+                    return cached_output
+
+        output, closed = await _stream_json_reply(agent, input, context.context)
+        max_tokens = agent.model_settings.max_tokens
+        if not closed and max_tokens:
+            # The JSON object never closed: most likely the reply was cut off at
+            # max_tokens. Retry once with double the budget.
+            logger.warning(
+                "%s reply ended without a closing brace; retrying with max_tokens=%d",
+                tool_name,
+                max_tokens * 2,
+            )
+            output, closed = await _stream_json_reply(
+                agent,
+                input,
+                context.context,
+                RunConfig(model_settings=ModelSettings(max_tokens=max_tokens * 2)),
+            )
+
+        if cache_key is not None or semantic is not None:
+            try:
+                validate(output)
+            except ValueError:
+                logger.debug("Not caching unparseable %s reply", tool_name)
+            else:
+                if cache_key is not None:
+                    _llm_cache.put(cache_key, output)
+                if semantic is not None:
+                    await _semcache.store(*semantic, output)
+        return output
+
+    return run_agent
+
+
+def _analyzer_semantic_key(input: str) -> tuple[str, str] | None:
+    """Maps an AnalyzerAgentTool input (a stub's JSON) to its semantic-cache key."""
+    try:
+        stub = SampleStub.model_validate_json(extract_code_block(input) or input)
+    except ValueError:
+        return None
+    return _semcache.analyzer_key(settings.MODEL_ANALYZER, ANALYZER_INSTRUCTIONS, stub)
+
+
+# (tool_name, tool_description) of the specialist tools, in the order they are
+# sent to the model. The SDK sends tool schemas in a separate `tools` field,
+# which providers place ahead of the system prompt in the cached prefix, so
+# these strings and their order are fixed here rather than built per run.
+_TOOL_SPECS: tuple[tuple[str, str], ...] = (
+    (
+        "DesignerAgentTool",
+        "Expands a user's sound design brief into a structured plan (JSON) "
+        "detailing themes and individual sound stubs with descriptions and "
+        "target durations. Input is the user brief string.",
+    ),
+    (
+        "AnalyzerAgentTool",
+        "Takes a single sound stub (JSON from DesignerAgentTool's plan) and "
+        "enriches it into a detailed, natural-language synthesis recipe (JSON). "
+        "Input is a JSON string of the sound stub.",
+    ),
+    (
+        "CompilerAgentTool",
+        "Takes a detailed synthesis recipe (JSON from AnalyzerAgentTool), "
+        "generates Python DSP code, orchestrates its execution and validation "
+        "using its internal tools, and returns the path to a validated temporary "
+        ".wav file (string). Input is a JSON string of the synthesis recipe.",
+    ),
+)
+
+
+@functools.cache
+def _specialist_tools() -> tuple[FunctionTool, ...]:
+    """
+    Builds the Designer/Analyzer/Compiler tools once per process, on the shared
+    agent instances (`get_designer_agent` and friends), so constructing another
+    OrchestratorAgent does not rebuild the specialist agents or their tools.
+    """
+    # Anything per-run belongs in the run input, not in these tools: a changed
+    # schema invalidates the provider's cached prefix (see `_TOOL_SPECS`).
+    designer_spec, analyzer_spec, compiler_spec = _TOOL_SPECS
+    return (
+        _cached_agent_tool(
+            get_designer_agent(settings.MODEL_DESIGNER),
+            settings.MODEL_DESIGNER,
+            *designer_spec,
+            validate=parse_designer_output,
+            semantic_key=functools.partial(
+                _semcache.designer_key, settings.MODEL_DESIGNER, DESIGNER_INSTRUCTIONS
+            ),
+        ),
+        _cached_agent_tool(
+            get_analyzer_agent(settings.MODEL_ANALYZER),
+            settings.MODEL_ANALYZER,
+            *analyzer_spec,
+            validate=parse_analyzer_output,
+            semantic_key=_analyzer_semantic_key,
+        ),
+        # Not cached: the compiler's reply is the path of a temporary .wav
+        # file that the orchestrator moves away afterwards.
+        # The compiler's repair loop resends the recipe every turn; its model
+        # caches that prefix and resends only the latest attempts.
+        get_compiler_agent(settings.MODEL_COMPILER).as_tool(*compiler_spec),
+    )
+
+
 ORCHESTRATOR_INSTRUCTIONS_PATH = PROMPTS_DIR / "orchestrator.md"
 
 
@@ -83,46 +275,19 @@ class OrchestratorAgent(Agent):
         """
         agent_name = kwargs.pop("name", "PhonosyneOrchestrator_Agent")
         # Assuming a model for the orchestrator, or use a general powerful model
+        # A Model instance (like the sub-agents') rather than a name, so the
+        # orchestrator's long system prompt carries its cache_control marker
+        # regardless of the RunConfig the run is started with.
         model = kwargs.pop(
-            "model", getattr(settings, "MODEL_ORCHESTRATOR", settings.MODEL_DEFAULT)
-        )
-        # The OrchestratorAgent itself will get its model_provider from the RunConfig
-        # when Runner.run is called in sdk.py.
-
-        # Instantiate specialist agents by providing them with Model instances
-        # obtained from our OPENROUTER_MODEL_PROVIDER.
-        designer_model_instance = OPENROUTER_MODEL_PROVIDER.get_model(
-            settings.MODEL_DESIGNER
-        )
-        designer_agent_instance = DesignerAgent(model=designer_model_instance)
-
-        analyzer_model_instance = OPENROUTER_MODEL_PROVIDER.get_model(
-            settings.MODEL_ANALYZER
-        )
-        analyzer_agent_instance = AnalyzerAgent(model=analyzer_model_instance)
-
-        compiler_model_instance = OPENROUTER_MODEL_PROVIDER.get_model(
-            settings.MODEL_COMPILER
+            "model",
+            OPENROUTER_MODEL_PROVIDER.get_model(
+                getattr(settings, "MODEL_ORCHESTRATOR", settings.MODEL_DEFAULT)
+            ),
         )
-        compiler_agent_instance = CompilerAgent(model=compiler_model_instance)
 
-        # Prepare tools for the OrchestratorAgent
-        agent_tools: List[Any] = [
-            designer_agent_instance.as_tool(
-                tool_name="DesignerAgentTool",
-                tool_description="Expands a user's sound design brief into a structured plan (JSON) detailing themes and individual sound stubs with descriptions and target durations. Input is the user brief string.",
-            ),
-            analyzer_agent_instance.as_tool(
-                tool_name="AnalyzerAgentTool",
-                tool_description="Takes a single sound stub (JSON from DesignerAgentTool's plan) and enriches it into a detailed, natural-language synthesis recipe (JSON). Input is a JSON string of the sound stub.",
-            ),
-            compiler_agent_instance.as_tool(
-                tool_name="CompilerAgentTool",
-                tool_description="Takes a detailed synthesis recipe (JSON from AnalyzerAgentTool), generates Python DSP code, orchestrates its execution and validation using its internal tools, and returns the path to a validated temporary .wav file (string). Input is a JSON string of the synthesis recipe.",
-            ),
-            move_file,
-            generate_manifest_file,
-        ]
+        # The specialist tools (and the agents behind them) are shared by every
+        # orchestrator in the process; see `_specialist_tools`.
+        agent_tools: List[Any] = [*_specialist_tools(), move_file, generate_manifest_file]
 
         # Load instructions from the markdown file
         orchestrator_instructions = load_instructions_from_file(
@@ -147,9 +312,3 @@ class OrchestratorAgent(Agent):
             **kwargs,
         )
 
-
-# The old Manager class and its methods like _process_single_sample, run,
-# and _static_process_single_sample are now superseded by the OrchestratorAgent's
-# instruction-driven workflow using the agents SDK.
-# The main application entry point (phonosyne.run_prompt) will instantiate and
-# run this OrchestratorAgent.
@@ -11,28 +11,99 @@ Key features:
 - `AnalyzerInput`: Defines the input structure for the AnalyzerAgent (derived from SampleStub).
 - `AnalyzerOutput`: Defines the structured output of the AnalyzerAgent, which serves
                    as input to the CompilerAgent.
+- `BatchAnalyzerInput` / `BatchAnalyzerOutput`: Wrap several stubs/recipes for a
+                   single batched AnalyzerAgent call.
+- `json_schema_response_format`: Cached strict `response_format` payloads for
+  provider-native structured output.
+- `AnalyzerOutputMsg`: Optional `msgspec.Struct` mirror of `AnalyzerOutput` used
+  to decode and validate analyzer replies on the hot path (see `MSGSPEC_AVAILABLE`).
 
 @dependencies
-- `pydantic.BaseModel` for creating data validation models.
+- `pydantic.BaseModel` / `pydantic.ConfigDict` for creating data validation models.
 - `pydantic.Field` for detailed field configuration (e.g., constraints).
 - `typing.List` for defining lists of other models.
 - `phonosyne.settings` for default values like sample rate.
+- `agents.strict_schema.ensure_strict_json_schema` for strict JSON schemas.
+- `msgspec` (optional) for `AnalyzerOutputMsg`.
 
 @notes
 - These schemas enforce data consistency throughout the agent pipeline.
-- Field constraints (e.g., `gt=0` for duration) help catch errors early.
+- Field constraints (e.g., `ge=0.1` for duration) help catch errors early.
+- Models are frozen. `Model.trusted(...)` skips validation for data that was
+  already validated; LLM replies are always validated in full.
 - The schemas are based on the JSON structures described in the prompt files
   (e.g., `prompts/designer.md`, `prompts/analyzer.md`).
 """
 
-from typing import List, Optional
+import functools
+from typing import Annotated, Any, List, Optional, Self
 
-from pydantic import BaseModel, Field, field_validator
+from agents.strict_schema import ensure_strict_json_schema
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
 
 from phonosyne import settings
 
+# msgspec is an optional dependency used only when settings.MSGSPEC_PARSE is enabled.
+try:
+    import msgspec
 
-class SampleStub(BaseModel):
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+
+# Dump options for models sent to an LLM (see `_SchemaModel.transport_json`).
+_TRANSPORT_DUMP_KWARGS: dict[str, Any] = dict(exclude_none=True, by_alias=False)
+
+
+class _SchemaModel(BaseModel):
+    """
+    Base for the pipeline schemas: immutable once built (they are passed between
+    agents and stages, never edited), unknown keys from LLM replies are dropped.
+    """
+
+    model_config = ConfigDict(
+        frozen=True,
+        extra="ignore",
+        validate_assignment=False,
+        validate_default=False,
+        # Validators/serializers are built on first use, so schemas that a run
+        # never touches cost nothing at import.
+        defer_build=True,
+        # Pinned explicitly: no field is `bytes` today, and any that is added
+        # should reach the LLM as text rather than base64.
+        ser_json_bytes="utf8",
+    )
+
+    def transport_json(self) -> str:
+        """
+        Serializes the model for an LLM call (tool input or user message):
+        compact JSON without `None` fields, since every byte is billed as input.
+        """
+        return self.model_dump_json(**_TRANSPORT_DUMP_KWARGS)
+
+    def transport_dict(self) -> dict[str, Any]:
+        """
+        Like `transport_json`, as a dict for embedding in a larger document
+        serialized with `dumps_json`. Dumped in python mode: the schemas only
+        hold str/float/list fields, which orjson (or `json`) serializes natively,
+        so pydantic's JSON-mode conversion pass would be wasted work.
+        """
+        return self.model_dump(mode="python", **_TRANSPORT_DUMP_KWARGS)
+
+    @classmethod
+    def trusted(cls, **data: Any) -> Self:
+        """
+        Builds an instance without running validators or type coercion
+        (`model_construct`). Only for data that was already validated, e.g. a
+        schema-checked reply or an instance's own `model_dump()`; nested models
+        must be passed as model instances, not dicts. Replies straight from an
+        LLM go through `model_validate`/`model_validate_json` instead.
+        """
+        return cls.model_construct(**data)
+
+
+class SampleStub(_SchemaModel):
     """
     Represents a single sample's initial description as planned by the DesignerAgent.
     This is part of a MovementStub.
@@ -42,22 +113,17 @@ class SampleStub(BaseModel):
         ..., description="Unique identifier for the sample (e.g., 'L1.1', 'A1')."
     )
     # module: Optional[str] = Field(None, description="Optional module hint (e.g., 'lubadh', 'arbhar').") # As per designer.md, but might be simplified
-    seed_description: str = Field(
+    seed_description: Annotated[str, StringConstraints(min_length=1)] = Field(
         ...,
-        description="Concise natural-language description of the sound sample (max 200 chars as per plan).",
+        description="Concise natural-language description of the sound sample (60-80 words as per designer.md).",
     )
     duration: float = Field(
         ...,
         description="Requested duration of the sample in seconds.",
     )
 
-    @field_validator("id")
-    @classmethod
-    def id_format(cls, v: str) -> str:
-        return v
-
 
-class DesignerOutput(BaseModel):
+class DesignerOutput(_SchemaModel):
     """
     Represents the overall output of the DesignerAgent.
     This is the main plan for generating the sound collection.
@@ -70,7 +136,7 @@ class DesignerOutput(BaseModel):
     )
 
 
-class AnalyzerInput(BaseModel):
+class AnalyzerInput(_SchemaModel):
     """
     Represents the input to the AnalyzerAgent for a single sample.
     This is typically derived from a SampleStub.
@@ -84,7 +150,7 @@ class AnalyzerInput(BaseModel):
     # sample_rate: int = Field(default=settings.DEFAULT_SR, description="Target sample rate in Hz.") # Analyzer prompt implies SR is part of its output
 
 
-class AnalyzerOutput(BaseModel):
+class AnalyzerOutput(_SchemaModel):
     """
     Represents the structured output of the AnalyzerAgent.
     This serves as the input to the CompilerAgent.
@@ -97,29 +163,107 @@ class AnalyzerOutput(BaseModel):
     )
     duration: float = Field(
         ...,
-        description="Duration of the sound effect in seconds.",
+        ge=0.1,
+        description="Duration of the sound effect in seconds (at least 0.1).",
     )
-    description: str = Field(
+    # Length and range checks are declared as constraints, so pydantic-core
+    # enforces them in Rust instead of calling Python validators per field.
+    description: Annotated[str, StringConstraints(min_length=10)] = Field(
         ...,
-        description="Detailed natural-language instructions for synthesizing the sound (min 40 chars as per spec, max ~120 words as per analyzer.md).",
+        description="Detailed natural-language instructions for synthesizing the sound (≈ 200-800 words as per analyzer.md).",
     )
 
-    @field_validator("duration")
-    @classmethod
-    def duration_min_value(cls, v: float) -> float:
-        if v < 0.1:
-            raise ValueError("Duration must be at least 0.1 seconds.")
-        return v
 
-    @field_validator("description")
-    @classmethod
-    def description_min_length(cls, v: str) -> str:
-        # Technical spec says "rich natural-language (>= 40 chars)"
-        # Analyzer prompt says "Keep it under ~120 words"
-        if len(v) < 10:  # Relaxed from 40 for initial stubs, real check in agent
-            # raise ValueError("Description must be at least 40 characters long.")
-            pass  # Actual validation can be stricter in the agent itself
-        return v
+class BatchAnalyzerInput(_SchemaModel):
+    """
+    Represents several AnalyzerAgent inputs sent in a single LLM call.
+    """
+
+    items: List[AnalyzerInput] = Field(
+        ..., description="The sample stubs to expand, in order."
+    )
+
+
+class BatchAnalyzerOutput(_SchemaModel):
+    """
+    Represents the AnalyzerAgent's reply to a `BatchAnalyzerInput`.
+    Items are in the same order as the input items.
+    """
+
+    items: List[AnalyzerOutput] = Field(
+        ..., description="One synthesis recipe per input stub, in input order."
+    )
+
+
+def _drop_string_length_bounds(schema: Any) -> None:
+    """
+    Removes `minLength`/`maxLength` in place: OpenAI's strict structured-output
+    mode rejects them for strings. They are still checked on parse.
+    """
+    if isinstance(schema, dict):
+        schema.pop("minLength", None)
+        schema.pop("maxLength", None)
+        for value in schema.values():
+            _drop_string_length_bounds(value)
+    elif isinstance(schema, list):
+        for value in schema:
+            _drop_string_length_bounds(value)
+
+
+@functools.cache
+def json_schema_response_format(name: str, model: type[BaseModel]) -> dict[str, Any]:
+    """
+    Builds a strict `response_format={"type": "json_schema", ...}` payload for
+    `model`, so the provider constrains decoding to parseable, schema-valid JSON.
+
+    The schema is generated once per model and shared by every agent instance,
+    so callers must treat the returned dict as read-only. (It is sent as JSON in
+    `extra_body`, so it cannot be wrapped in a `MappingProxyType`.)
+    """
+    schema = ensure_strict_json_schema(model.model_json_schema())
+    _drop_string_length_bounds(schema)
+    if model is AnalyzerOutput or "AnalyzerOutput" in schema.get("$defs", {}):
+        recipe_schema = schema.get("$defs", {}).get("AnalyzerOutput", schema)
+        recipe_schema["properties"]["effect_name"]["pattern"] = "^[a-z0-9_]+$"
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": name, "schema": schema, "strict": True},
+    }
+
+
+if MSGSPEC_AVAILABLE:
+
+    class AnalyzerOutputMsg(msgspec.Struct):
+        """
+        `msgspec` mirror of `AnalyzerOutput` for decoding analyzer replies.
+        Decoding straight into this struct validates types, the duration bound
+        and the description length in one pass, without building a pydantic
+        model per field.
+        """
+
+        effect_name: str
+        duration: Annotated[float, msgspec.Meta(ge=0.1)]
+        description: Annotated[str, msgspec.Meta(min_length=10)]
+
+        def to_pydantic(self) -> AnalyzerOutput:
+            """Converts to the public `AnalyzerOutput` (already validated)."""
+            return AnalyzerOutput.trusted(
+                effect_name=self.effect_name,
+                duration=self.duration,
+                description=self.description,
+            )
+
+        @classmethod
+        def decode(cls, data: bytes) -> AnalyzerOutput | None:
+            """
+            Decodes a clean JSON reply into an `AnalyzerOutput`, or returns None
+            if it is not valid JSON or fails validation (e.g. it is wrapped in
+            fences or prose), so callers need not handle `msgspec` errors.
+            """
+            try:
+                return msgspec.json.decode(data, type=cls).to_pydantic()
+            except (msgspec.DecodeError, msgspec.ValidationError):
+                return None
 
 
 if __name__ == "__main__":
@@ -6,7 +6,9 @@ It allows users to run the sound generation pipeline from the command line.
 
 Key features:
 - `run` command to initiate the sound generation process.
-- Arguments for user prompt, number of workers, and verbosity.
+- `batch` command to run many briefs from a file on one shared agent tree.
+- `master`/`trim` (and their `*-all` directory variants) for post-processing.
+- Arguments for user prompt and verbosity.
 - Calls the main SDK function `phonosyne.run_prompt`.
 - Provides user-friendly output and error handling.
 
@@ -14,105 +16,157 @@ Key features:
 - `typer` for creating the CLI application.
 - `typing.Optional` for type hinting optional arguments.
 - `phonosyne.run_prompt` (the main SDK entry point).
-- `phonosyne.settings` (for default values, though Typer can have its own defaults).
+- `phonosyne.dsp` (mastering and silence trimming).
 - `logging` for configuring log levels based on verbosity.
-- `rich.console` for potentially richer terminal output (optional).
+- `rich.console` for potentially richer terminal output (optional); panels and
+  tables are only built when stdout is a terminal.
 
 @notes
-- This CLI will be registered as an entry point in `pyproject.toml` (Step 6.1).
+- Registered as the `phonosyne` entry point (`phonosyne.cli:app`) in `pyproject.toml`.
 - Error messages from the pipeline should be caught and presented clearly to the user.
 """
 
-import asyncio
+import functools
 import logging
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, as_completed, wait
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Optional
 
 import typer
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.text import Text
 
 from phonosyne import __version__
-from phonosyne import run_prompt as sdk_run_prompt
-from phonosyne.dsp.master import apply_mastering
-from phonosyne.dsp.trim import trim_silence
-from phonosyne.sdk import OpenRouterCreditsError, PhonosyneError
+
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.table import Table
+
+# Each command imports what it needs itself: `phonosyne.sdk` (and with it the
+# `agents` SDK) for the pipeline commands, `phonosyne.dsp` (numpy, scipy,
+# soundfile) and the process/thread pools for `master`/`trim`, and rich only
+# once something is printed. `--help` and `--version` load none of these.
 
 # Initialize Typer app
 app = typer.Typer(
     name="phonosyne",
     help="Phonosyne: Multi-Agent Sound-Library Generator.",
     add_completion=False,
+    # Plain click help: no help text uses rich markup, and `--help` then needs
+    # no rich import at all.
+    rich_markup_mode=None,
+    # Commands report their own errors (with `traceback.format_exc()` under
+    # `--verbose`); skip rich's traceback rendering and its walk over locals.
+    pretty_exceptions_enable=False,
+    pretty_exceptions_show_locals=False,
 )
 
-console = Console()
-error_console = Console(stderr=True, style="bold red")
+
+# Fixed output text and styles, built once rather than per command.
+_BANNER = f"Phonosyne v{__version__}"
+_SUCCESS_STYLE = "bold green"
+
+
+@functools.cache
+def _get_console() -> "Console":
+    """The stdout Console, built on first use."""
+    from rich.console import Console
+
+    return Console()
+
+
+@functools.cache
+def _get_error_console() -> "Console":
+    """The stderr Console for error messages, built on first use."""
+    from rich.console import Console
+
+    return Console(stderr=True, style="bold red")
 
 
 def version_callback(value: bool):
     if value:
-        console.print(f"Phonosyne CLI Version: {__version__}", style="bold green")
+        # Plain typer output: `--version` must not pull in rich.
+        typer.secho(f"Phonosyne CLI Version: {__version__}", fg="green", bold=True)
         raise typer.Exit()
 
 
-@app.command(help="Run the Phonosyne sound generation pipeline with a user brief.")
-def run(  # Changed to synchronous def
-    prompt: str = typer.Argument(
-        ..., help="The user's natural-language sound design brief."
-    ),
-    verbose: bool = typer.Option(
-        False, "--verbose", "-v", help="Enable verbose logging output.", is_flag=True
-    ),
-    # output_dir option removed as it's not directly used by the new run_prompt
-    # and OrchestratorAgent handles its own output directory logic based on instructions.
-    # workers option removed as num_workers is no longer a parameter to run_prompt.
-):
+_LOG_FORMATTER = logging.Formatter(
+    fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
+# The CLI's own stream handler, installed on the root logger on first use.
+_LOG_HANDLER = logging.StreamHandler()
+_LOG_HANDLER.setFormatter(_LOG_FORMATTER)
+
+# Root/`phonosyne` log level by `--verbose` flag.
+_LOG_LEVELS: dict[bool, int] = {True: logging.DEBUG, False: logging.INFO}
+
+# Levels for chatty HTTP-library loggers, fixed regardless of `--verbose`.
+_THIRD_PARTY_LEVELS: dict[str, int] = {
+    "httpx": logging.WARNING,
+    "httpcore": logging.WARNING,
+    "openai": logging.INFO,
+    # The logger used by openai's base client for HTTP details.
+    "openai._base_client": logging.INFO,
+}
+
+
+def _set_level(logger_: logging.Logger, level: int) -> None:
+    # Logger.setLevel clears the level cache of every logger in the process;
+    # skip it when the level would not change.
+    if logger_.level != level:
+        logger_.setLevel(level)
+
+
+def _print_panel(text: str, title: Optional[str] = None) -> None:
+    """Prints `text` in a rich Panel on a terminal, as plain text otherwise."""
+    console = _get_console()
+    if not console.is_terminal:
+        print(text)
+        return
+    from rich.panel import Panel
+    from rich.text import Text
+
+    justify = "center" if title is None else "left"
+    console.print(Panel(Text(text, justify=justify, style=_SUCCESS_STYLE), title=title))
+
+
+def configure_logging(verbose: bool) -> None:
     """
-    Runs the Phonosyne sound generation pipeline.
+    Configures root and `phonosyne` logging for a pipeline command.
+
+    Idempotent: the handler and the HTTP-library levels are installed once per
+    process; later calls only switch the level (and do nothing if it is
+    unchanged), so repeated commands in one process never duplicate output.
     """
     # Configure logging based on verbosity
-    log_level = logging.DEBUG if verbose else logging.INFO
-    # A more robust logging setup might involve a shared logger configuration module.
-    # For now, basic configuration:
-    # logging.basicConfig(
-    #     level=log_level,
-    #     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    #     datefmt="%Y-%m-%d %H:%M:%S",
-    # )
-    # Get the root logger
+    log_level = _LOG_LEVELS[verbose]
     root_logger = logging.getLogger()  # Get the root logger
-    root_logger.setLevel(log_level)  # Set level for your app
+    installed = _LOG_HANDLER in root_logger.handlers
+    if installed and _LOG_HANDLER.level == log_level:
+        return
 
     # Also set the level for the main app logger "phonosyne"
     phonosyne_logger = logging.getLogger("phonosyne")
-    phonosyne_logger.setLevel(log_level)
-
-    # Remove any existing handlers to avoid duplicate messages or conflicts
-    for handler in root_logger.handlers[:]:
-        root_logger.removeHandler(handler)
-
-    # Add a new stream handler for your application
-    stream_handler = logging.StreamHandler()
-    stream_handler.setLevel(log_level)
-    formatter = logging.Formatter(
-        fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-    stream_handler.setFormatter(formatter)
-    root_logger.addHandler(stream_handler)
 
-    # Suppress overly verbose logs from common HTTP libraries
-    # These should be set AFTER your root logger and its handlers are configured.
-    logging.getLogger("httpx").setLevel(logging.WARNING)
-    logging.getLogger("httpcore").setLevel(logging.WARNING)
-    logging.getLogger("openai").setLevel(logging.INFO)
-    # Specifically target the logger used by openai's base client for HTTP details
-    logging.getLogger("openai._base_client").setLevel(logging.INFO)
+    if not installed:
+        # Replace any existing handlers to avoid duplicate messages or conflicts.
+        # Cleared in place: no list copy and no per-handler lock/scan, as
+        # removeHandler would do (the CLI configures this before any threads).
+        root_logger.handlers.clear()
+        root_logger.addHandler(_LOG_HANDLER)
+
+        # Suppress overly verbose logs from common HTTP libraries
+        for name, level in _THIRD_PARTY_LEVELS.items():
+            _set_level(logging.getLogger(name), level)
+
+    _set_level(root_logger, log_level)  # Set level for your app
+    _set_level(phonosyne_logger, log_level)
+    _LOG_HANDLER.setLevel(log_level)
 
     if verbose:
-        console.print("Verbose mode enabled. Log level set to DEBUG.", style="dim")
+        _get_console().print(
+            "Verbose mode enabled. Log level set to DEBUG.", style="dim"
+        )
         root_logger.debug("Root logger reconfigured for DEBUG level by CLI.")
         phonosyne_logger.debug(
             "Phonosyne specific loggers also reconfigured for DEBUG level by CLI."
@@ -124,31 +178,45 @@ def run(  # Changed to synchronous def
             "Phonosyne specific loggers reconfigured for INFO level by CLI."
         )
 
-    console.print(
-        Panel(Text(f"Phonosyne v{__version__}", justify="center", style="bold green"))
+
+@app.command(help="Run the Phonosyne sound generation pipeline with a user brief.")
+def run(  # Changed to synchronous def
+    prompt: str = typer.Argument(
+        ..., help="The user's natural-language sound design brief."
+    ),
+    verbose: bool = typer.Option(
+        False, "--verbose", "-v", help="Enable verbose logging output.", is_flag=True
+    ),
+):
+    """
+    Runs the Phonosyne sound generation pipeline.
+    """
+    from phonosyne.sdk import (
+        OpenRouterCreditsError,
+        PhonosyneError,
+        run_prompt_sync,
     )
+
+    console = _get_console()
+    error_console = _get_error_console()
+
+    configure_logging(verbose)
+
+    _print_panel(_BANNER)
     console.print(f'🚀 Starting generation for prompt: "{prompt}"', style="cyan")
-    # Removed messages for workers and output_dir as these options are removed.
 
     try:
-        # Call the async SDK function using asyncio.run() from the synchronous command
+        # Call the async SDK function from the synchronous command, on a
+        # uvloop loop when available (see `phonosyne.sdk.run_prompt_sync`).
         # The verbose flag is used for local logging setup.
-        # It's also passed as a kwarg to sdk_run_prompt, which passes it to OrchestratorAgent.
-        result = asyncio.run(sdk_run_prompt(prompt=prompt))
-
-        console.print("\n🎉 Generation Pipeline Complete!", style="bold green")
+        result = run_prompt_sync(prompt)
 
-        summary_table = Table(title="Generation Summary")
-        summary_table.add_column("Metric", style="dim")
-        summary_table.add_column("Value")
+        console.print("\n🎉 Generation Pipeline Complete!", style=_SUCCESS_STYLE)
 
-        # The result from the new run_prompt is expected to be a string summary.
-        # We need to adapt how results are displayed.
-        # For now, just print the string result.
-        # A more structured result from OrchestratorAgent (e.g. a JSON string or Pydantic model)
+        # The result from run_prompt is a string summary of the run.
+        # A more structured result (e.g. a JSON string or Pydantic model)
         # would allow for a richer summary table like before.
-        # Assuming result is the final string output from OrchestratorAgent.
-        console.print(Panel(Text(str(result), style="bold green"), title="Run Result"))
+        _print_panel(str(result), title="Run Result")
 
         # Success! The SDK already handles errors via exceptions (OpenRouterCreditsError, PhonosyneError)
         # so if we reached here, the run completed successfully.
@@ -178,6 +246,93 @@ def run(  # Changed to synchronous def
         raise typer.Exit(code=1)
 
 
+def _batch_summary_table() -> "Table":
+    """Returns an empty `batch` summary table; the command only adds rows."""
+    from rich.table import Table
+
+    table = Table(title="Batch Summary")
+    table.add_column("#", style="dim")
+    table.add_column("Brief")
+    table.add_column("Result")
+    return table
+
+
+@app.command(help="Run the pipeline for every brief in a file, reusing one agent tree.")
+def batch(
+    prompts_file: Path = typer.Argument(
+        ...,
+        help="File with one brief per line (plain text, or JSON objects with a 'prompt' key).",
+    ),
+    concurrency: int = typer.Option(
+        2, "--concurrency", "-c", min=1, help="Briefs processed at the same time."
+    ),
+    verbose: bool = typer.Option(
+        False, "--verbose", "-v", help="Enable verbose logging output.", is_flag=True
+    ),
+):
+    """
+    Runs the Phonosyne pipeline for each brief in a file.
+    """
+    from phonosyne.sdk import run_async
+    from phonosyne.sdk import run_prompts as sdk_run_prompts
+    from phonosyne.utils.string_utils import loads_json
+
+    console = _get_console()
+    error_console = _get_error_console()
+
+    configure_logging(verbose)
+
+    prompts: list[str] = []
+    for line in prompts_file.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("{"):
+            try:
+                line = str(loads_json(line)["prompt"])
+            except (ValueError, KeyError, TypeError):
+                pass  # Not a {"prompt": ...} object; use the line as the brief.
+        prompts.append(line)
+    if not prompts:
+        error_console.print(f"No briefs found in {prompts_file}")
+        raise typer.Exit(code=1)
+
+    console.print(
+        f"🚀 Running {len(prompts)} briefs from [cyan]{prompts_file}[/cyan] "
+        f"(concurrency {concurrency})",
+        style="cyan",
+    )
+    results = run_async(sdk_run_prompts(prompts, max_concurrency=concurrency))
+
+    rows = [
+        (
+            str(index),
+            prompt[:60],
+            (
+                f"{type(result).__name__}: {result}"
+                if isinstance(result, BaseException)
+                else str(result)
+            ),
+            isinstance(result, BaseException),
+        )
+        for index, (prompt, result) in enumerate(zip(prompts, results), start=1)
+    ]
+    if console.is_terminal:
+        from rich.text import Text
+
+        summary_table = _batch_summary_table()
+        for index, prompt, outcome, failed in rows:
+            summary_table.add_row(
+                index, prompt, Text(outcome, style="red" if failed else "green")
+            )
+        console.print(summary_table)
+    else:
+        for index, prompt, outcome, _ in rows:
+            print(f"{index}\t{prompt}\t{outcome}")
+    if any(failed for *_, failed in rows):
+        raise typer.Exit(code=1)
+
+
 @app.command(help="Run the mastering effect.")
 def master(
     input_file: Path = typer.Argument(
@@ -193,6 +348,10 @@ def master(
     """
     Run the mastering effect on an audio file.
     """
+    from phonosyne.dsp.master import apply_mastering
+
+    console = _get_console()
+
     console.print(f"🎚️ Mastering [cyan]{input_file}[/cyan]...")
     apply_mastering(input_file, output_file)
     console.print(f"✅ Mastered [green]{output_file}[/green]")
@@ -219,6 +378,11 @@ def trim(
     """
     Trim silence from the beginning and end of an audio file.
     """
+    from phonosyne.dsp.trim import trim_silence
+
+    console = _get_console()
+    error_console = _get_error_console()
+
     console.print(f"✂️ Trimming [cyan]{input_file}[/cyan] (top_db={top_db})...")
     stats = trim_silence(input_file, output_file, top_db=top_db)
     if stats:
@@ -231,6 +395,32 @@ def trim(
         error_console.print(f"❌ Failed to trim {input_file}")
 
 
+def _iter_wavs(directory: Path) -> Iterator[Path]:
+    """Yields the .wav files under `directory` as the directory walk finds them."""
+    return directory.rglob("*.wav")
+
+
+def _submit_streaming(
+    submit: Callable[[Path], Future], paths: Iterable[Path], max_pending: int
+) -> Iterator[tuple[Path, Future]]:
+    """
+    Submits a job per path (via `submit`), keeping at most `max_pending` jobs
+    queued or running, and yields each `(path, future)` as it completes.
+
+    `paths` is consumed lazily, so a large directory walk is never held in
+    memory and the first job starts as soon as the first file is found.
+    """
+    pending: dict[Future, Path] = {}
+    for path in paths:
+        pending[submit(path)] = path
+        if len(pending) >= max_pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future
+    for future in as_completed(list(pending)):
+        yield pending[future], future
+
+
 @app.command(help="Trim silence from all .wav files in a directory.")
 def trim_all(
     directory: Path = typer.Argument(
@@ -242,35 +432,69 @@ def trim_all(
         "-t",
         help="The threshold (in decibels) below reference to consider as silence.",
     ),
+    jobs: int = typer.Option(
+        os.cpu_count() or 1,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Files trimmed at the same time.",
+    ),
 ):
     """
     Trims silence from all .wav files in a directory.
     """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from rich.progress import MofNCompleteColumn, Progress, SpinnerColumn, TextColumn
+
+    from phonosyne.dsp.trim import trim_silence
+
+    console = _get_console()
+    error_console = _get_error_console()
+
     if not directory.is_dir():
         error_console.print(f"Error: {directory} is not a directory.")
         raise typer.Exit(code=1)
 
-    wav_files = list(directory.rglob("*.wav"))
-    if not wav_files:
-        console.print(f"No .wav files found in {directory}", style="yellow")
-        return
-
     console.print(
-        f"🔍 Found [bold]{len(wav_files)}[/bold] .wav files in [cyan]{directory}[/cyan]",
-        style="cyan",
+        f"🔍 Trimming .wav files in [cyan]{directory}[/cyan]", style="cyan"
     )
 
-    processed_count = 0
-    with console.status("[bold green]Trimming silence...") as status:
-        for wav_file in wav_files:
-            status.update(f"[bold green]Trimming {wav_file.name}...")
-            stats = trim_silence(wav_file, wav_file, top_db=top_db)
-            if stats:
-                processed_count += 1
-
+    found_count = processed_count = 0
+    # One progress counter instead of a status line re-rendered (and its markup
+    # re-parsed) per file; the bar redraws at a fixed rate however fast files
+    # finish. The total is unknown while the directory walk is still running.
+    progress = Progress(
+        SpinnerColumn(),
+        TextColumn("Trimming silence...", style=_SUCCESS_STYLE, markup=False),
+        MofNCompleteColumn(),
+        console=console,
+        transient=True,
+    )
+    with progress:
+        task = progress.add_task("trim", total=None)
+        # Decoding, trimming and writing happen in librosa/soundfile code that
+        # releases the GIL, so threads are enough (and need no pickling).
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            completed = _submit_streaming(
+                lambda wav_file: executor.submit(
+                    trim_silence, wav_file, wav_file, top_db=top_db
+                ),
+                _iter_wavs(directory),
+                max_pending=2 * jobs,
+            )
+            for wav_file, future in completed:
+                found_count += 1
+                if future.result():
+                    processed_count += 1
+                progress.advance(task)
+
+    if not found_count:
+        console.print(f"No .wav files found in {directory}", style="yellow")
+        return
     console.print(
-        f"✅ Finished! Trimmed [bold]{processed_count}/{len(wav_files)}[/bold] files.",
-        style="bold green",
+        f"✅ Finished! Trimmed [bold]{processed_count}/{found_count}[/bold] files.",
+        style=_SUCCESS_STYLE,
     )
 
 
@@ -279,38 +503,64 @@ def master_all(
     directory: Path = typer.Argument(
         ..., help="The directory containing .wav files to master."
     ),
+    jobs: int = typer.Option(
+        os.cpu_count() or 1,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Files mastered at the same time.",
+    ),
 ):
     """
     Applies mastering to all .wav files in a directory.
     """
+    from concurrent.futures import ProcessPoolExecutor
+
+    from phonosyne.dsp.master import apply_mastering
+
+    console = _get_console()
+    error_console = _get_error_console()
+
     if not directory.is_dir():
         error_console.print(f"Error: {directory} is not a directory.")
         raise typer.Exit(code=1)
 
-    wav_files = list(directory.rglob("*.wav"))
-    if not wav_files:
-        console.print(f"No .wav files found in {directory}", style="yellow")
-        return
-
     console.print(
-        f"🔍 Found [bold]{len(wav_files)}[/bold] .wav files in [cyan]{directory}[/cyan]",
-        style="cyan",
+        f"🔍 Mastering .wav files in [cyan]{directory}[/cyan]", style="cyan"
     )
 
-    processed_count = 0
+    found_count = processed_count = 0
     # Mastering is intensive, so we don't use console.status if it already prints a lot.
-    # However, a wrapper around the output might be nice.
-    for wav_file in wav_files:
-        console.print(f"🎚️ Mastering {wav_file.name}...")
-        try:
-            apply_mastering(wav_file, wav_file)
-            processed_count += 1
-        except Exception as e:
-            error_console.print(f"❌ Failed to master {wav_file}: {e}")
-
+    # The compressor's envelope follower is a per-sample Python loop that holds
+    # the GIL, so files are mastered in separate processes rather than threads.
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        completed = _submit_streaming(
+            lambda wav_file: executor.submit(apply_mastering, wav_file, wav_file),
+            _iter_wavs(directory),
+            max_pending=2 * jobs,
+        )
+        for wav_file, future in completed:
+            found_count += 1
+            try:
+                future.result()
+                processed_count += 1
+                # Plain text: file names are not markup, and nothing to parse.
+                console.print(
+                    f"🎚️ Mastered {wav_file.name}", markup=False, highlight=False
+                )
+            except Exception as e:
+                error_console.print(
+                    f"❌ Failed to master {wav_file}: {e}",
+                    markup=False,
+                    highlight=False,
+                )
+
+    if not found_count:
+        console.print(f"No .wav files found in {directory}", style="yellow")
+        return
     console.print(
-        f"✅ Finished! Mastered [bold]{processed_count}/{len(wav_files)}[/bold] files.",
-        style="bold green",
+        f"✅ Finished! Mastered [bold]{processed_count}/{found_count}[/bold] files.",
+        style=_SUCCESS_STYLE,
     )
 
 
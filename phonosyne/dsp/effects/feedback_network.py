@@ -604,7 +604,10 @@ def apply_feedback_network(
         current_write_pos_nodes[node.id] = 0
         if node.delay_s * sample_rate > delay_line_len:
             logger.warning(
-                f"Node {node.id} delay_s {node.delay_s}s exceeds its max_delay_s {max_delay_s}s buffer. Clamping delay."
+                "Node %s delay_s %ss exceeds its max_delay_s %ss buffer. Clamping delay.",
+                node.id,
+                node.delay_s,
+                max_delay_s,
             )
         max_total_delay_samples = max(
             max_total_delay_samples, int(node.delay_s * sample_rate)
@@ -26,12 +26,15 @@ def trim_silence(input_path, output_path, top_db=40):
         duration_after = len(y_trimmed) / sr
 
         logger.info(
-            f"Trimmed {input_path}: {duration_before:.2f}s -> {duration_after:.2f}s"
+            "Trimmed %s: %.2fs -> %.2fs",
+            input_path,
+            duration_before,
+            duration_after,
         )
 
         # Save output
         sf.write(output_path, y_trimmed, sr)
         return duration_before, duration_after
     except Exception as e:
-        logger.error(f"Error trimming {input_path}: {e}")
+        logger.error("Error trimming %s: %s", input_path, e)
         return None
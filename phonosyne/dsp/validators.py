@@ -137,7 +137,9 @@ def validate_wav(file_path: Path, effect_name: str, duration: float) -> bool:
                 # For robustness in calculation, we'll average to mono.
                 # A warning/error about unexpected channels might be better if spec is strictly mono.
                 logger.debug(
-                    f"Audio data for {file_path} has {raw_audio_data.shape[1]} channels; averaging to mono for peak/silence check."
+                    "Audio data for %s has %s channels; averaging to mono for peak/silence check.",
+                    file_path,
+                    raw_audio_data.shape[1],
                 )
                 audio_data_mono = np.mean(raw_audio_data, axis=1)
         else:
@@ -187,7 +189,8 @@ def validate_wav(file_path: Path, effect_name: str, duration: float) -> bool:
             if APPLY_BANDPASS_FILTER_FOR_SILENCE and audio_for_silence_check.size > 0:
                 if not np.issubdtype(audio_for_silence_check.dtype, np.floating):
                     logger.debug(
-                        f"Audio data for silence check dtype is {audio_for_silence_check.dtype}. Converting to float32."
+                        "Audio data for silence check dtype is %s. Converting to float32.",
+                        audio_for_silence_check.dtype,
                     )
                     audio_for_silence_check = audio_for_silence_check.astype(np.float32)
 
@@ -220,20 +223,26 @@ def validate_wav(file_path: Path, effect_name: str, duration: float) -> bool:
                                 sos, audio_for_silence_check
                             )
                             logger.debug(
-                                f"Applied band-pass filter ({FILTER_LOW_CUT_HZ}Hz - {FILTER_HIGH_CUT_HZ}Hz) "
-                                f"to audio data for silence check."
+                                "Applied band-pass filter (%sHz - %sHz) to audio data for silence check.",
+                                FILTER_LOW_CUT_HZ,
+                                FILTER_HIGH_CUT_HZ,
                             )
                         except Exception as e_filter:
                             logger.warning(
-                                f"Error applying band-pass filter for silence check: {e_filter}. Proceeding with unfiltered audio for silence check."
+                                "Error applying band-pass filter for silence check: %s. Proceeding with unfiltered audio for silence check.",
+                                e_filter,
                             )
                     else:
                         logger.debug(
-                            f"Audio data length {len(audio_for_silence_check)} too short for filtering (min_len ~{min_len_for_filter}). Skipping filter for silence check."
+                            "Audio data length %s too short for filtering (min_len ~%s). Skipping filter for silence check.",
+                            len(audio_for_silence_check),
+                            min_len_for_filter,
                         )
                 else:
                     logger.debug(
-                        f"Invalid filter cutoffs for silence check (low_norm: {low_norm:.4f}, high_norm: {high_norm:.4f}). Skipping filter."
+                        "Invalid filter cutoffs for silence check (low_norm: %.4f, high_norm: %.4f). Skipping filter.",
+                        low_norm,
+                        high_norm,
                     )
             # --- END AUDIO FILTERING FOR SILENCE CHECK ---
 
@@ -259,6 +268,8 @@ def validate_wav(file_path: Path, effect_name: str, duration: float) -> bool:
         raise ValidationFailedError(full_error_message)
 
     logger.info(
-        f"WAV file {file_path} passed all validation checks against spec for '{effect_name}'."
+        "WAV file %s passed all validation checks against spec for '%s'.",
+        file_path,
+        effect_name,
     )
     return True
@@ -0,0 +1,478 @@
+"""
+Deterministic Phonosyne Pipeline
+
+This module drives the Designer → Analyzer → Compiler workflow directly from
+Python instead of leaving the control flow to the OrchestratorAgent's
+instructions. The stubs of a plan are independent, so every stage after the
+design fans out over all of them at once.
+
+Key features:
+- `run_pipeline`: one streamed DesignerAgent run; each stub's Analyzer →
+  Compiler chain starts as soon as that stub has streamed in ("staircase"
+  streaming), while the Designer keeps generating the rest of the plan. The
+  analyzer reply is streamed too, and the compiler's output setup starts once
+  its header has arrived (`settings.ANALYZER_STREAMING`).
+  Analyzer and Compiler calls are each bounded by an adaptive limit of
+  `settings.MAX_CONCURRENCY` that halves for a while after a 429. The limits
+  are shared by all runs on the event loop (see `_stage_limiters`), so
+  concurrent briefs do not multiply the number of in-flight calls.
+- Large plans can be analyzed through OpenAI's Batch API instead
+  (`phonosyne.agents.analyzer_batch`, opt-in via `settings.ANALYZER_BATCH_API`),
+  or several stubs per live analyzer call (`settings.ANALYZER_BATCH_SIZE`).
+- Moves each validated `.wav` into the run's output directory and writes
+  `manifest.json`, as the orchestrator's instructions describe.
+- A failed sample is recorded in the manifest and does not stop the others.
+
+@dependencies
+- `agents.Runner` / `agents.RunConfig` (from the SDK)
+- `phonosyne.agents.designer` (`get_designer_agent`, `parse_designer_output`)
+- `phonosyne.agents.compiler` (`get_compiler_agent`, `CompilerAgent.prepare`)
+- `phonosyne.agents.analyzer` (`get_analyzer_agent`, `parse_analyzer_output`)
+- `phonosyne.agents.analyzer_batch` (optional Batch API path for the analyzer)
+- `phonosyne.agents._semcache` (optional semantic cache for plans)
+- `phonosyne.sdk` (model provider, logging hooks, retry policy, `analyze_samples`,
+  `sample_completions`)
+- `phonosyne.utils` (`slugify`, JSON helpers)
+- `agents.ItemHelpers`
+- `asyncio`, `logging`, `shutil`, `pathlib`, `weakref`
+
+@notes
+- Selected by `settings.PIPELINE_MODE == "direct"` (the default); the
+  instruction-driven OrchestratorAgent remains available as `"agent"`.
+- SuperCollider renders are still serialized by the render tool, since sclang
+  talks to one scsynth over fixed ports; only the LLM calls overlap.
+"""
+
+import asyncio
+import logging
+import shutil
+import weakref
+from pathlib import Path
+from typing import Any, Callable
+
+from agents import ItemHelpers, RunConfig, Runner
+
+from phonosyne import settings
+from phonosyne.agents import _semcache
+from phonosyne.agents.analyzer import get_analyzer_agent, parse_analyzer_output
+from phonosyne.agents.analyzer_batch import analyze_batch, batch_api_available
+from phonosyne.agents.compiler import (
+    CompilerAgent,
+    compiler_input,
+    get_compiler_agent,
+    wip_wav_path,
+)
+from phonosyne.agents.designer import (
+    DESIGNER_INSTRUCTIONS,
+    get_designer_agent,
+    parse_designer_output,
+)
+from phonosyne.agents.schemas import (
+    AnalyzerInput,
+    AnalyzerOutput,
+    DesignerOutput,
+    SampleStub,
+)
+from phonosyne.sdk import (
+    DEFAULT_LOGGING_HOOKS,
+    OPENROUTER_MODEL_PROVIDER,
+    AdaptiveConcurrencyLimiter,
+    PhonosyneError,
+    analyze_sample,
+    analyze_samples,
+    is_retryable_llm_error,
+    llm_retrying,
+    sample_completions,
+)
+from phonosyne.utils.slugify import slugify
+from phonosyne.utils.string_utils import JsonArrayItemScanner, dumps_json
+
+logger = logging.getLogger(__name__)
+
+
+def _designer_semantic_key(brief: str) -> tuple[str, str]:
+    return _semcache.designer_key(
+        settings.MODEL_DESIGNER, DESIGNER_INSTRUCTIONS, brief
+    )
+
+
+async def _semantic_cached_plan(brief: str) -> DesignerOutput | None:
+    """Returns the plan stored for a near-identical brief, if the cache is on."""
+    if not _semcache.is_enabled():
+        return None
+    cached = await _semcache.lookup(*_designer_semantic_key(brief), "design")
+    if cached is None:
+        return None
+    try:
+        return parse_designer_output(cached)
+    except ValueError:  # Stored by an older schema; design afresh.
+        return None
+
+
+async def _design(brief: str, run_config: RunConfig) -> DesignerOutput:
+    """
+    Runs the DesignerAgent, retrying transient errors and unparseable plans.
+
+    With `settings.DESIGNER_CANDIDATES` above 1, the first request draws that
+    many candidate plans at once (`sample_completions`) and the first one that
+    parses is used, so a malformed plan does not cost another round trip.
+    """
+    designer = get_designer_agent(settings.MODEL_DESIGNER)
+    if settings.DESIGNER_CANDIDATES > 1:
+        candidates = await sample_completions(
+            designer, brief, settings.DESIGNER_CANDIDATES
+        )
+        for candidate in candidates:
+            try:
+                return parse_designer_output(candidate)
+            except ValueError as e:
+                logger.debug("Skipping unparseable candidate plan (%s)", e)
+        logger.warning(
+            "None of %d candidate plans parsed; designing again", len(candidates)
+        )
+    async for attempt in llm_retrying():
+        with attempt:
+            result = await Runner.run(
+                starting_agent=designer,
+                input=brief,
+                run_config=run_config,
+                hooks=DEFAULT_LOGGING_HOOKS,
+            )
+            plan = parse_designer_output(str(result.final_output))
+    return plan
+
+
+async def _design_streaming(
+    brief: str, run_config: RunConfig, on_stub: Callable[[SampleStub], None]
+) -> DesignerOutput:
+    """
+    Runs the DesignerAgent with a streamed reply, calling `on_stub` for every
+    sample stub as soon as its JSON object has closed.
+
+    Raises:
+        ValueError: If the complete reply is not a valid plan.
+    """
+    result = Runner.run_streamed(
+        starting_agent=get_designer_agent(settings.MODEL_DESIGNER),
+        input=brief,
+        run_config=run_config,
+        hooks=DEFAULT_LOGGING_HOOKS,
+    )
+    scanner = JsonArrayItemScanner("samples")
+    chunks: list[str] = []
+    async for event in result.stream_events():
+        if event.type != "raw_response_event":
+            continue
+        if getattr(event.data, "type", None) != "response.output_text.delta":
+            continue
+        chunks.append(event.data.delta)
+        for item in scanner.feed(event.data.delta):
+            try:
+                on_stub(SampleStub.model_validate_json(item))
+            except ValueError as e:
+                logger.debug("Skipping unparseable streamed stub (%s)", e)
+    return parse_designer_output(
+        "".join(chunks) or ItemHelpers.text_message_outputs(result.new_items)
+    )
+
+
+async def _analyze(plan: DesignerOutput) -> list[AnalyzerOutput | BaseException]:
+    """
+    Analyzes every stub of `plan`: through the Batch API when it applies (see
+    `batch_api_available`), with live concurrent runs (see `_analyze_live`)
+    for everything else.
+    """
+    stubs = plan.samples
+    recipes: list[AnalyzerOutput | BaseException | None] = [None] * len(stubs)
+    if batch_api_available(len(stubs)):
+        try:
+            recipes = list(await analyze_batch(stubs))
+        except Exception as e:
+            logger.warning("Analyzer batch failed (%s); analyzing live instead", e)
+
+    # Stubs the batch did not cover (or all of them) go through the live path.
+    pending = [
+        i for i, recipe in enumerate(recipes) if not isinstance(recipe, AnalyzerOutput)
+    ]
+    live_recipes = await _analyze_live([stubs[i] for i in pending])
+    for i, recipe in zip(pending, live_recipes):
+        recipes[i] = recipe
+    return recipes
+
+
+async def _analyze_live(
+    stubs: list[SampleStub],
+) -> list[AnalyzerOutput | BaseException]:
+    """
+    Analyzes `stubs` with live LLM calls. With `settings.ANALYZER_BATCH_SIZE`
+    above 1, that many stubs share each call (`AnalyzerAgent.run_batch`); stubs
+    whose batch failed are then analyzed one per call, like all stubs otherwise.
+    """
+    recipes: list[AnalyzerOutput | BaseException | None] = [None] * len(stubs)
+    if settings.ANALYZER_BATCH_SIZE > 1 and len(stubs) > 1:
+        analyzer = get_analyzer_agent(settings.MODEL_ANALYZER)
+        recipes = list(
+            await analyzer.run_batch(
+                [
+                    AnalyzerInput.trusted(
+                        id=stub.id,
+                        seed_description=stub.seed_description,
+                        duration=stub.duration,
+                    )
+                    for stub in stubs
+                ]
+            )
+        )
+        failed = sum(isinstance(recipe, BaseException) for recipe in recipes)
+        if failed:
+            logger.warning(
+                "%d stubs failed in analyzer batches; analyzing them singly", failed
+            )
+
+    pending = [
+        i for i, recipe in enumerate(recipes) if not isinstance(recipe, AnalyzerOutput)
+    ]
+    live_outputs = await analyze_samples([stubs[i] for i in pending])
+    for i, output in zip(pending, live_outputs):
+        # Live outputs were already validated by analyze_samples.
+        if isinstance(output, BaseException):
+            recipes[i] = output
+        else:
+            recipes[i] = parse_analyzer_output(output)
+    return recipes
+
+
+def _final_stem(stub: SampleStub, recipe: AnalyzerOutput) -> str:
+    """
+    The file name stem of a finished sample: its effect name, prefixed by the
+    stub id unless the analyzer already did so. Ids are unique within a plan,
+    so two recipes with the same effect name cannot overwrite each other.
+    """
+    if recipe.effect_name.startswith(f"{stub.id}_"):
+        return recipe.effect_name
+    return f"{stub.id}_{recipe.effect_name}"
+
+
+_Limiters = tuple[AdaptiveConcurrencyLimiter, AdaptiveConcurrencyLimiter]
+# Event loop -> (analyze, compile) limiters shared by every run on that loop.
+_STAGE_LIMITERS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _Limiters]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _stage_limiters() -> _Limiters:
+    """
+    Returns the running loop's analyze and compile limiters, creating them on
+    first use. Concurrent runs (e.g. `sdk.run_prompts`) share them, so the
+    number of in-flight sub-agent calls per stage stays within
+    `settings.MAX_CONCURRENCY` however many briefs are running.
+    """
+    loop = asyncio.get_running_loop()
+    limiters = _STAGE_LIMITERS.get(loop)
+    if limiters is None:
+        limiters = (
+            AdaptiveConcurrencyLimiter(settings.MAX_CONCURRENCY),
+            AdaptiveConcurrencyLimiter(settings.MAX_CONCURRENCY),
+        )
+        _STAGE_LIMITERS[loop] = limiters
+    return limiters
+
+
+class _SampleRunner:
+    """
+    Takes one sample from stub (or ready recipe) to a `.wav` in the run's
+    output directory. Created inside the run's event loop; its stage limiters
+    are shared with the other runs on that loop (see `_stage_limiters`).
+    """
+
+    def __init__(self, output_dir: Path, run_config: RunConfig) -> None:
+        self.output_dir = output_dir
+        self.run_config = run_config
+        self.analyze_limiter, self.compile_limiter = _stage_limiters()
+
+    async def _analyze(self, stub: SampleStub) -> tuple[AnalyzerOutput, Path | None]:
+        """
+        Analyzes `stub`. With `settings.ANALYZER_STREAMING` (and no response
+        cache, which serves replies whole) the reply is streamed, and
+        `CompilerAgent.prepare` sets up the compiler's output path as soon as
+        the recipe header has arrived, while the description is still being
+        generated.
+
+        Returns:
+            The recipe, and the prepared output path (None if none was prepared).
+        """
+        if (
+            not settings.ANALYZER_STREAMING
+            or settings.LLM_CACHE_ENABLED
+            or _semcache.is_enabled()
+        ):
+            # Already validated by analyze_sample.
+            output = await analyze_sample(stub, self.analyze_limiter)
+            return parse_analyzer_output(output), None
+        analyzer = get_analyzer_agent(settings.MODEL_ANALYZER)
+        async for attempt in llm_retrying():
+            with attempt:
+                async with self.analyze_limiter:
+                    recipe, wip_path = await analyzer.run_streaming(
+                        stub, on_header=CompilerAgent.prepare
+                    )
+        return recipe, wip_path
+
+    async def _compile(
+        self, recipe: AnalyzerOutput, wip_path: Path | None = None
+    ) -> Path:
+        async with self.compile_limiter:
+            result = await Runner.run(
+                starting_agent=get_compiler_agent(settings.MODEL_COMPILER),
+                input=compiler_input(
+                    recipe, wip_path or wip_wav_path(recipe.effect_name)
+                ),
+                max_turns=settings.MAX_TURNS,
+                run_config=self.run_config,
+                hooks=DEFAULT_LOGGING_HOOKS,
+            )
+        wav_path = Path(str(result.final_output).strip().strip("`\"'"))
+        if not wav_path.is_file():
+            raise PhonosyneError(
+                f"Compiler did not return a rendered file for {recipe.effect_name}: "
+                f"{str(result.final_output)[:200]}"
+            )
+        return wav_path
+
+    async def run(
+        self,
+        stub: SampleStub,
+        recipe: AnalyzerOutput | BaseException | None = None,
+    ) -> dict[str, Any]:
+        """
+        Analyzes `stub` (unless `recipe` is given), compiles the recipe and
+        moves the file into place.
+
+        Returns:
+            The sample's manifest entry; failures are recorded in it, not raised.
+        """
+        entry: dict[str, Any] = {
+            "id": stub.id,
+            "seed_description": stub.seed_description,
+            "duration": stub.duration,
+            "recipe": None,
+            "file_name": None,
+            "status": "failed_analysis",
+            "error": None,
+        }
+        wip_path = None
+        try:
+            if recipe is None:
+                recipe, wip_path = await self._analyze(stub)
+            elif isinstance(recipe, BaseException):
+                raise recipe
+        except Exception as e:
+            entry["error"] = f"{type(e).__name__}: {e}"
+            return entry
+        entry["recipe"] = recipe.model_dump()
+
+        try:
+            wav_path = await self._compile(recipe, wip_path)
+        except Exception as e:
+            entry["status"] = "failed_compilation"
+            entry["error"] = f"{type(e).__name__}: {e}"
+            return entry
+
+        target = self.output_dir / f"{_final_stem(stub, recipe)}.wav"
+        try:
+            await asyncio.to_thread(shutil.move, wav_path, target)
+        except OSError as e:
+            entry["status"] = "failed_file_move"
+            entry["error"] = str(e)
+            return entry
+        entry["status"] = "success"
+        entry["file_name"] = target.name
+        entry["duration"] = recipe.duration
+        return entry
+
+
+async def run_pipeline(brief: str) -> str:
+    """
+    Generates a sample library for `brief` with a fixed Designer → Analyzer →
+    Compiler fan-out, then writes `manifest.json`.
+
+    Args:
+        brief: The user's natural-language sound design brief.
+
+    Returns:
+        A short summary of the run (output directory and sample counts).
+
+    Raises:
+        PhonosyneError: If no usable plan could be designed.
+    """
+    run_config = RunConfig(model_provider=OPENROUTER_MODEL_PROVIDER)
+    output_dir = Path(settings.DEFAULT_OUT_DIR) / slugify(brief)[:50]
+    output_dir.mkdir(parents=True, exist_ok=True)
+    sample_runner = _SampleRunner(output_dir, run_config)
+    # Sample id -> the task taking that sample to a manifest entry.
+    tasks: dict[str, asyncio.Task] = {}
+
+    def _start(
+        stub: SampleStub, recipe: AnalyzerOutput | BaseException | None = None
+    ) -> None:
+        if stub.id not in tasks:
+            tasks[stub.id] = asyncio.create_task(sample_runner.run(stub, recipe))
+
+    try:
+        if settings.ANALYZER_BATCH_API or settings.ANALYZER_BATCH_SIZE > 1:
+            # Batching needs every stub up front, so the plan is not streamed.
+            plan = await _design(brief, run_config)
+            for stub, recipe in zip(plan.samples, await _analyze(plan)):
+                _start(stub, recipe)
+        elif (cached_plan := await _semantic_cached_plan(brief)) is not None:
+            plan = cached_plan
+            for stub in plan.samples:
+                _start(stub)
+        else:
+            try:
+                plan = await _design_streaming(brief, run_config, _start)
+            except Exception as e:
+                # The stream is not retried itself (stubs may already be running);
+                # an invalid plan, a 429/5xx or a dropped connection falls back.
+                if not is_retryable_llm_error(e):
+                    raise
+                if not tasks:
+                    logger.warning("Streamed design failed (%s); designing again", e)
+                    plan = await _design(brief, run_config)
+                else:
+                    # Most likely cut off; go on with the stubs that did arrive.
+                    logger.warning(
+                        "Streamed design failed (%s); continuing with %d stubs",
+                        e,
+                        len(tasks),
+                    )
+                    plan = None
+            if plan is not None:
+                for stub in plan.samples:  # Any stub the stream did not yield.
+                    _start(stub)
+                if _semcache.is_enabled():
+                    await _semcache.store(
+                        *_designer_semantic_key(brief), plan.model_dump_json()
+                    )
+        logger.info("Plan has %d samples", len(tasks))
+        entries = await asyncio.gather(*tasks.values())
+    except ValueError as e:
+        raise PhonosyneError(f"DesignerAgent did not return a valid plan: {e}") from e
+    finally:
+        for task in tasks.values():
+            task.cancel()  # No-op for finished tasks; stops orphans on failure.
+
+    manifest = {
+        "brief": brief,
+        "plan": plan.model_dump() if plan is not None else None,
+        "samples": entries,
+    }
+    (output_dir / "manifest.json").write_text(
+        dumps_json(manifest, indent=True), encoding="utf-8"
+    )
+
+    succeeded = sum(entry["status"] == "success" for entry in entries)
+    return (
+        f"Generated {succeeded} of {len(entries)} samples in {output_dir} "
+        f"(manifest: {output_dir / 'manifest.json'})"
+    )
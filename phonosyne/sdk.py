@@ -5,8 +5,16 @@ This module contains the core SDK logic for Phonosyne, including the
 `run_prompt` function and the configuration for using OpenRouter.
 """
 
+import asyncio
+import atexit
+import contextlib
+import functools
+import importlib.util
 import logging
-from typing import Any, TypeVar
+import sys
+import threading
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Callable, Coroutine, Sequence, TypeVar
 
 from agents import (
     Agent,
@@ -20,27 +28,121 @@ from agents import (
     Tool,
     set_tracing_disabled,
 )
-from openai import AsyncOpenAI, OpenAIError
+import httpx
+from openai import (
+    APIConnectionError,
+    APIStatusError,
+    AsyncOpenAI,
+    DefaultAsyncHttpxClient,
+    OpenAIError,
+)
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 
 from . import settings
 
+# uvloop is an optional dependency used only when settings.USE_UVLOOP is enabled.
+try:
+    import uvloop
+
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+if TYPE_CHECKING:
+    from .agents.schemas import SampleStub
+
+_T = TypeVar("_T")
+
 # Import the OrchestratorAgent from its location
 # Assuming it's in .agents.orchestrator relative to the phonosyne package root
 # from .agents.orchestrator import OrchestratorAgent # Moved to run_prompt
 
 # --- OpenRouter Configuration (sourced from settings) ---
+# Checked once at import; agents share the client below and never re-check.
 if not settings.OPENROUTER_API_KEY:
     raise ValueError(
         "OPENROUTER_API_KEY is not set in environment variables or .env file. "
         "Please set it to your OpenRouter API key. It should be loaded via phonosyne.settings."
     )
 
+# One pooled HTTP client shared by every agent, so keep-alive connections (and
+# their TCP/TLS handshakes) are reused across all LLM calls in the process.
+# HTTP/2 multiplexes concurrent requests over one connection when `h2` is installed.
+# Connections are bound to the event loop that opened them, so the pool pays off
+# most when run_prompt/analyze_samples are awaited from one long-lived loop.
+openrouter_http_client = DefaultAsyncHttpxClient(
+    http2=settings.HTTP2_ENABLED and importlib.util.find_spec("h2") is not None,
+    limits=httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    ),
+    timeout=httpx.Timeout(
+        connect=settings.LLM_CONNECT_TIMEOUT,
+        read=settings.LLM_READ_TIMEOUT,
+        write=settings.LLM_WRITE_TIMEOUT,
+        pool=settings.LLM_POOL_TIMEOUT,
+    ),
+)
+
+
+def _close_http_client() -> None:
+    # Close the pooled connections on the loop that opened them (see
+    # `_thread_loop`); atexit runs on the main thread, whose loop that is.
+    loop = getattr(_thread_state, "loop", None)
+    try:
+        if loop is not None and not loop.is_closed():
+            loop.run_until_complete(openrouter_http_client.aclose())
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+        else:
+            asyncio.run(openrouter_http_client.aclose())
+    except Exception:  # The loop the connections were bound to may already be gone.
+        pass
+
+
+atexit.register(_close_http_client)
+
+# Strong references to in-flight pre-warm tasks (the event loop only keeps weak ones).
+_prewarm_tasks: set[asyncio.Task] = set()
+
+
+async def _prewarm(client: httpx.AsyncClient) -> None:
+    """
+    Opens a pooled connection to OpenRouter (DNS + TCP + TLS) with a cheap HEAD
+    request, so the first chat completion does not pay the handshake. Never
+    raises: a failed pre-warm just means the first real call connects itself.
+    """
+    try:
+        await client.head(f"{settings.OPENROUTER_BASE_URL}/models", timeout=5.0)
+    except Exception as e:
+        logger.debug("OpenRouter connection pre-warm failed: %s", e)
+
+
+def start_prewarm() -> None:
+    """
+    Schedules `_prewarm` on the running loop when `settings.PREWARM_LLM_CONNECTION`
+    is enabled, overlapping the handshake with agent construction.
+    """
+    if not settings.PREWARM_LLM_CONNECTION:
+        return
+    task = asyncio.get_running_loop().create_task(_prewarm(openrouter_http_client))
+    _prewarm_tasks.add(task)
+    task.add_done_callback(_prewarm_tasks.discard)
+
+
 openrouter_client = AsyncOpenAI(
     base_url=settings.OPENROUTER_BASE_URL,
     api_key=settings.OPENROUTER_API_KEY,
+    http_client=openrouter_http_client,
+    # Authorization and Content-Type are set by the client itself from `api_key`.
     default_headers={
-        "Authorization": f"Bearer {settings.OPENROUTER_API_KEY}",
-        "Content-Type": "application/json",
         "HTTP-Referer": "https://github.com/scragz/phonosyne",
         "X-Title": "Phonosyne",
     },
@@ -49,23 +151,253 @@ openrouter_client = AsyncOpenAI(
 set_tracing_disabled(disabled=False)
 
 
+def event_loop_factory() -> Callable[[], asyncio.AbstractEventLoop]:
+    """
+    Returns the factory for the event loops Phonosyne runs on: uvloop's when it
+    is available and enabled (`settings.USE_UVLOOP`), cutting per-await
+    overhead when many LLM calls are in flight, asyncio's default otherwise.
+    uvloop is never used on Windows, where it is unsupported.
+    """
+    if settings.USE_UVLOOP and UVLOOP_AVAILABLE and sys.platform != "win32":
+        return uvloop.new_event_loop
+    return asyncio.new_event_loop
+
+
+_thread_state = threading.local()
+
+
+def _thread_loop() -> asyncio.AbstractEventLoop:
+    """
+    Returns this thread's long-lived event loop (from `event_loop_factory`),
+    creating it on first use or after it was closed.
+    """
+    loop = getattr(_thread_state, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = event_loop_factory()()
+        _thread_state.loop = loop
+    return loop
+
+
+def run_async(coro: Coroutine[Any, Any, _T]) -> _T:
+    """
+    Runs `coro` to completion from synchronous code, like `asyncio.run`, but on
+    the calling thread's long-lived loop (see `_thread_loop`) instead of a new
+    one per call. Later calls in the same process (another command, a test
+    harness invoking the CLI repeatedly) reuse the loop and, with it, the
+    shared HTTP client's keep-alive connections, which are bound to the loop
+    that opened them. The loop is closed at exit, with the HTTP client.
+
+    The loop comes from `event_loop_factory` rather than a global event loop
+    policy (deprecated since Python 3.14), so importing or calling Phonosyne
+    never changes the loop type of the host application.
+
+    Must not be called from inside a running event loop.
+    """
+    return _thread_loop().run_until_complete(coro)
+
+
+def supports_prompt_cache_control(model_name: str) -> bool:
+    """
+    Whether explicit `cache_control` prompt-caching markers should be sent for
+    `model_name`. OpenAI models cache long prefixes automatically, so only the
+    providers in `settings.PROMPT_CACHE_MODEL_PREFIXES` get markers.
+    """
+    return settings.PROMPT_CACHE_ENABLED and model_name.startswith(
+        settings.PROMPT_CACHE_MODEL_PREFIXES
+    )
+
+
+def _with_system_cache_breakpoint(
+    messages: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """
+    Returns `messages` with an ephemeral `cache_control` breakpoint on the
+    leading system message (the agent's static instructions), so repeat calls
+    with the same instructions skip prefill of the cached prefix.
+    """
+    if not messages or messages[0].get("role") != "system":
+        return messages
+    system = messages[0]
+    if not isinstance(system.get("content"), str):
+        return messages
+    marked = {
+        **system,
+        "content": [
+            {
+                "type": "text",
+                "text": system["content"],
+                "cache_control": {"type": "ephemeral"},
+            }
+        ],
+    }
+    return [marked, *messages[1:]]
+
+
+def _with_input_cache_breakpoint(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Returns `messages` with an ephemeral `cache_control` breakpoint on the first
+    user message (the task input, e.g. a synthesis recipe), so every later turn
+    of a multi-turn tool loop reuses the cached system + input prefix.
+    """
+    for index, message in enumerate(messages):
+        if message.get("role") != "user":
+            continue
+        if not isinstance(message.get("content"), str):
+            break
+        marked = {
+            **message,
+            "content": [
+                {
+                    "type": "text",
+                    "text": message["content"],
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ],
+        }
+        return [*messages[:index], marked, *messages[index + 1 :]]
+    return messages
+
+
+def _trim_tool_rounds(
+    messages: list[dict[str, Any]], max_rounds: int
+) -> list[dict[str, Any]]:
+    """
+    Keeps the leading system/user messages and only the last `max_rounds`
+    assistant turns (each with its tool results), dropping older failed
+    attempts so a repair loop does not resend every earlier error.
+    """
+    round_starts = [
+        index
+        for index, message in enumerate(messages)
+        if message.get("role") == "assistant"
+    ]
+    if len(round_starts) <= max_rounds:
+        return messages
+    head = messages[: round_starts[0]]
+    return head + messages[round_starts[-max_rounds] :]
+
+
+class _MessageFilterCompletions:
+    """`chat.completions` wrapper that rewrites `messages` before each call."""
+
+    def __init__(
+        self,
+        completions: Any,
+        transform: Callable[[list[dict[str, Any]]], list[dict[str, Any]]],
+    ) -> None:
+        self._completions = completions
+        self._transform = transform
+
+    async def create(self, *, messages: list[dict[str, Any]], **kwargs: Any) -> Any:
+        return await self._completions.create(
+            messages=self._transform(messages), **kwargs
+        )
+
+
+class _MessageFilterClient:
+    """
+    Delegates to an `AsyncOpenAI` client, except that chat completion messages
+    are passed through `transform` first. The SDK converts input items to
+    messages itself (dropping unknown keys such as `cache_control`), so the
+    client call is the only place to adjust the final message list.
+    """
+
+    def __init__(
+        self,
+        client: AsyncOpenAI,
+        transform: Callable[[list[dict[str, Any]]], list[dict[str, Any]]],
+    ) -> None:
+        self._client = client
+        self.chat = SimpleNamespace(
+            completions=_MessageFilterCompletions(client.chat.completions, transform)
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+
+class OpenRouterChatCompletionsModel(OpenAIChatCompletionsModel):
+    """
+    An OpenAIChatCompletionsModel that marks the static system prompt with an
+    ephemeral `cache_control` breakpoint for providers that need explicit
+    prompt-caching markers (passed through by OpenRouter). Repeat calls with
+    the same instructions then skip prefill of the cached prefix. Like every
+    message rewrite here, this is done on the final message list by
+    `_MessageFilterClient`, not by overriding SDK internals.
+
+    With `cache_input_prefix=True` (for multi-turn agents such as the compiler's
+    repair loop), the first user message is marked as well, so retries also
+    skip prefill of the unchanging task input. With `max_history_rounds`, only
+    the most recent assistant/tool rounds are resent after the task input.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        openai_client: AsyncOpenAI,
+        cache_input_prefix: bool = False,
+        max_history_rounds: int | None = None,
+    ) -> None:
+        self.cache_system_prompt = supports_prompt_cache_control(model)
+        transforms: list[Callable[[list[dict[str, Any]]], list[dict[str, Any]]]] = []
+        if max_history_rounds:
+            transforms.append(
+                functools.partial(_trim_tool_rounds, max_rounds=max_history_rounds)
+            )
+        if self.cache_system_prompt:
+            transforms.append(_with_system_cache_breakpoint)
+            if cache_input_prefix:
+                transforms.append(_with_input_cache_breakpoint)
+        if transforms:
+
+            def _transform(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+                for transform in transforms:
+                    messages = transform(messages)
+                return messages
+
+            openai_client = _MessageFilterClient(openai_client, _transform)  # type: ignore[assignment]
+        super().__init__(model=model, openai_client=openai_client)
+
+
 class OpenRouterModelProvider(ModelProvider):
     """
     A custom model provider that directs LLM calls to OpenRouter.
     """
 
-    def get_model(self, model_name: str | None) -> Model:
+    def get_model(
+        self,
+        model_name: str | None,
+        cache_input_prefix: bool = False,
+        max_history_rounds: int | None = None,
+    ) -> Model:
         """
-        Provides an OpenAIChatCompletionsModel configured for OpenRouter.
+        Provides an OpenRouterChatCompletionsModel configured for OpenRouter.
         Uses DEFAULT_OPENROUTER_MODEL_NAME from settings if model_name is None.
+        `cache_input_prefix` and `max_history_rounds` are passed through to
+        `OpenRouterChatCompletionsModel`.
+
+        Models are shared per configuration: the Runner resolves agents whose
+        `model` is a name (e.g. the orchestrator) on every turn, and a shared
+        instance keeps its `cache_control` system block across those turns.
         """
         effective_model_name = model_name or settings.DEFAULT_OPENROUTER_MODEL_NAME
-        return OpenAIChatCompletionsModel(
-            model=effective_model_name,
-            openai_client=openrouter_client,
+        return _openrouter_model(
+            effective_model_name, cache_input_prefix, max_history_rounds
         )
 
 
+@functools.lru_cache(maxsize=32)
+def _openrouter_model(
+    model_name: str, cache_input_prefix: bool, max_history_rounds: int | None
+) -> OpenRouterChatCompletionsModel:
+    return OpenRouterChatCompletionsModel(
+        model=model_name,
+        openai_client=openrouter_client,
+        cache_input_prefix=cache_input_prefix,
+        max_history_rounds=max_history_rounds,
+    )
+
+
 OPENROUTER_MODEL_PROVIDER = OpenRouterModelProvider()
 # --- End OpenRouter Configuration ---
 
@@ -75,9 +407,16 @@ logger = logging.getLogger(__name__)
 TContext = TypeVar("TContext")
 
 
+def _display_name(obj: Any) -> str:
+    return obj.name if hasattr(obj, "name") else obj.__class__.__name__
+
+
 class LoggingRunHooks(RunHooks[TContext]):
     """
     A RunHooks implementation that logs all lifecycle events.
+
+    Hooks fire for every agent turn and tool call, so messages use lazy
+    %-formatting and skip building output snippets when INFO is disabled.
     """
 
     async def on_agent_start(
@@ -85,9 +424,8 @@ class LoggingRunHooks(RunHooks[TContext]):
         context: RunContextWrapper[TContext],
         agent: Agent[TContext],
     ) -> None:
-        logger.info(
-            f"Agent Start: {agent.name if hasattr(agent, 'name') else agent.__class__.__name__}"
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Agent Start: %s", _display_name(agent))
 
     async def on_agent_end(
         self,
@@ -95,9 +433,12 @@ class LoggingRunHooks(RunHooks[TContext]):
         agent: Agent[TContext],
         output: Any,
     ) -> None:
-        logger.info(
-            f"Agent End: {agent.name if hasattr(agent, 'name') else agent.__class__.__name__}, Output: {str(output)[:100]}..."
-        )  # Log snippet of output
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Agent End: %s, Output: %s...",
+                _display_name(agent),
+                str(output)[:100],  # Log snippet of output
+            )
 
     async def on_handoff(
         self,
@@ -105,9 +446,12 @@ class LoggingRunHooks(RunHooks[TContext]):
         from_agent: Agent[TContext],
         to_agent: Agent[TContext],
     ) -> None:
-        logger.info(
-            f"Handoff: From {from_agent.name if hasattr(from_agent, 'name') else from_agent.__class__.__name__} to {to_agent.name if hasattr(to_agent, 'name') else to_agent.__class__.__name__}"
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Handoff: From %s to %s",
+                _display_name(from_agent),
+                _display_name(to_agent),
+            )
 
     async def on_tool_start(
         self,
@@ -115,9 +459,12 @@ class LoggingRunHooks(RunHooks[TContext]):
         agent: Agent[TContext],
         tool: Tool,
     ) -> None:
-        logger.info(
-            f"Tool Start: {tool.name if hasattr(tool, 'name') else tool.__class__.__name__} by Agent: {agent.name if hasattr(agent, 'name') else agent.__class__.__name__}"
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Tool Start: %s by Agent: %s",
+                _display_name(tool),
+                _display_name(agent),
+            )
 
     async def on_tool_end(
         self,
@@ -126,9 +473,13 @@ class LoggingRunHooks(RunHooks[TContext]):
         tool: Tool,
         result: str,
     ) -> None:
-        logger.info(
-            f"Tool End: {tool.name if hasattr(tool, 'name') else tool.__class__.__name__} by Agent: {agent.name if hasattr(agent, 'name') else agent.__class__.__name__}, Result: {str(result)[:100]}..."
-        )  # Log snippet of result
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Tool End: %s by Agent: %s, Result: %s...",
+                _display_name(tool),
+                _display_name(agent),
+                str(result)[:100],  # Log snippet of result
+            )
 
 
 DEFAULT_LOGGING_HOOKS = LoggingRunHooks()
@@ -152,22 +503,190 @@ class OpenRouterCreditsError(PhonosyneError):
         super().__init__(self.message)
 
 
+def is_retryable_llm_error(exc: BaseException) -> bool:
+    """
+    Classifies an exception from an agent run as transient (worth retrying) or not.
+
+    Retryable: rate limiting (429), provider-side 5xx errors, connection errors
+    and timeouts, and replies that fail to parse or validate (`ValueError`,
+    which includes `pydantic.ValidationError`). Other 4xx errors such as bad
+    credentials or exhausted credits are not retried.
+    """
+    if isinstance(exc, APIStatusError):
+        return exc.status_code == 429 or exc.status_code >= 500
+    return isinstance(
+        exc,
+        (APIConnectionError, httpx.TransportError, asyncio.TimeoutError, ValueError),
+    )
+
+
+def _log_retry(retry_state: RetryCallState) -> None:
+    logger.warning(
+        "Retrying %s (attempt %d) after error: %r",
+        getattr(retry_state.fn, "__qualname__", "agent call"),
+        retry_state.attempt_number,
+        retry_state.outcome.exception() if retry_state.outcome else None,
+    )
+
+
+_backoff = wait_exponential_jitter(initial=1, max=30)
+
+
+def _wait_retry_after(retry_state: RetryCallState) -> float:
+    """
+    Waits as long as the provider asked via `Retry-After` (seconds) or
+    `retry-after-ms` on 429/503 responses, falling back to exponential backoff
+    with jitter when the header is absent or unparseable.
+    """
+    exc = retry_state.outcome.exception() if retry_state.outcome else None
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers is not None:
+        try:
+            if "retry-after-ms" in headers:
+                return min(float(headers["retry-after-ms"]) / 1000, 60.0)
+            if "retry-after" in headers:
+                return min(float(headers["retry-after"]), 60.0)
+        except ValueError:  # e.g. an HTTP-date value
+            pass
+    return _backoff(retry_state)
+
+
+def _stop_after_configured_attempts(retry_state: RetryCallState) -> bool:
+    # Reads the setting on every check, so runtime changes (e.g. in tests) apply.
+    return retry_state.attempt_number >= settings.ANALYZER_MAX_ATTEMPTS
+
+
+def llm_retrying(max_attempts: int | None = None) -> AsyncRetrying:
+    """
+    Returns the retry policy for agent runs: waits for the provider's
+    `Retry-After` when given, otherwise exponential backoff with jitter, on
+    transient errors (see `is_retryable_llm_error`), re-raising the last error.
+
+    Usage:
+        async for attempt in llm_retrying():
+            with attempt:
+                result = await Runner.run(...)
+
+    Args:
+        max_attempts: Attempts before giving up. Defaults to
+                      `settings.ANALYZER_MAX_ATTEMPTS`.
+    """
+    return AsyncRetrying(
+        wait=_wait_retry_after,
+        stop=(
+            stop_after_attempt(max_attempts)
+            if max_attempts
+            else _stop_after_configured_attempts
+        ),
+        retry=retry_if_exception(is_retryable_llm_error),
+        before_sleep=_log_retry,
+        reraise=True,
+    )
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    An `asyncio.Semaphore`-like limit on in-flight LLM calls that backs off
+    when the provider rate-limits: a 429 raised inside `async with limiter:`
+    halves the limit (down to 1) for `settings.RATE_LIMIT_COOLDOWN_SECONDS`,
+    after which the full limit applies again.
+
+    Create it inside the event loop that uses it.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.max_limit = max(1, limit)
+        self._limit = self.max_limit
+        self._restore_at = 0.0
+        self._in_use = 0
+        self._condition = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        """The current limit (reduced while cooling down after a 429)."""
+        if self._limit < self.max_limit:
+            if asyncio.get_running_loop().time() >= self._restore_at:
+                self._limit = self.max_limit
+        return self._limit
+
+    def throttle(self) -> None:
+        """Halves the limit and restarts the cool-down."""
+        self._limit = max(1, self._limit // 2)
+        self._restore_at = (
+            asyncio.get_running_loop().time() + settings.RATE_LIMIT_COOLDOWN_SECONDS
+        )
+        logger.warning("Rate limited; concurrency lowered to %d", self._limit)
+
+    async def __aenter__(self) -> None:
+        async with self._condition:
+            # Waiters are woken when a call finishes; one is always in flight
+            # while anyone waits, so a lapsed cool-down is noticed there.
+            await self._condition.wait_for(lambda: self._in_use < self.limit)
+            self._in_use += 1
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if isinstance(exc, APIStatusError) and exc.status_code == 429:
+            self.throttle()
+        async with self._condition:
+            self._in_use -= 1
+            self._condition.notify_all()
+
+
+_NO_KWARGS: frozenset = frozenset()
+
+
+@functools.lru_cache(maxsize=16)
+def _get_orchestrator(frozen_kwargs: frozenset) -> Agent:
+    """
+    Returns a shared OrchestratorAgent (and its Designer/Analyzer/Compiler
+    sub-agent tree) for the given constructor kwargs, building it on first use.
+
+    Agents hold only configuration; per-run state lives in the `Runner`, so one
+    instance can serve concurrent `run_prompt` calls on the same event loop.
+    Callers must not mutate the returned agent.
+    """
+    from .agents.orchestrator import OrchestratorAgent
+
+    return OrchestratorAgent(**dict(frozen_kwargs))
+
+
 async def run_prompt(
     prompt: str,
     **kwargs: Any,
 ) -> Any:
     """
-    Main SDK entry point to run the Phonosyne generation pipeline using OrchestratorAgent,
-    configured to use OpenRouter.
+    Main SDK entry point to run the Phonosyne generation pipeline, configured to
+    use OpenRouter. With `settings.PIPELINE_MODE == "direct"` (and no orchestrator
+    kwargs) the stages are driven by `phonosyne.pipeline.run_pipeline`; otherwise
+    the OrchestratorAgent runs the workflow from its instructions.
 
     Raises:
         OpenRouterCreditsError: When OpenRouter credits are exhausted
         PhonosyneError: For other Phonosyne-specific errors
         Exception: For other unexpected errors
     """
-    from .agents.orchestrator import OrchestratorAgent
-
-    orchestrator_agent = OrchestratorAgent(**kwargs)
+    start_prewarm()
+    # Orchestrator kwargs only apply to the instruction-driven workflow.
+    if settings.PIPELINE_MODE == "direct" and not kwargs:
+        from .pipeline import run_pipeline
+
+        try:
+            return await run_pipeline(prompt)
+        except PhonosyneError:
+            raise
+        except Exception as e:
+            raise _as_pipeline_error(e) from e
+
+    if not kwargs:  # The common case (e.g. the CLI): no key to build or hash.
+        orchestrator_agent = _get_orchestrator(_NO_KWARGS)
+    else:
+        try:
+            orchestrator_agent = _get_orchestrator(frozenset(kwargs.items()))
+        except TypeError:  # Unhashable kwarg values; build a one-off agent tree.
+            from .agents.orchestrator import OrchestratorAgent
+
+            orchestrator_agent = OrchestratorAgent(**kwargs)
 
     try:
         result = await Runner.run(
@@ -178,43 +697,262 @@ async def run_prompt(
             hooks=DEFAULT_LOGGING_HOOKS,  # Add the logging hooks
         )
         return result.final_output
-    except OpenAIError as e:
+    except Exception as e:
+        raise _as_pipeline_error(e) from e
+
+
+def _as_pipeline_error(e: Exception) -> PhonosyneError:
+    """
+    Logs an error raised during a pipeline run and maps it to the
+    `PhonosyneError` (or `OpenRouterCreditsError`) that `run_prompt` raises.
+    """
+    if isinstance(e, PhonosyneError):
+        return e
+    if isinstance(e, OpenAIError):
         # Handle OpenAI API errors that might be related to credits or authentication
+        # The error is re-raised with its message below; the traceback is only
+        # formatted when DEBUG logging (CLI --verbose) is on.
         logger.error(
-            f"OpenAI API error occurred: {type(e).__name__} - {str(e)}", exc_info=True
-        )  # Enhanced logging
+            "OpenAI API error occurred: %s - %s",
+            type(e).__name__,
+            e,
+            exc_info=logger.isEnabledFor(logging.DEBUG),
+        )
         error_message = str(e).lower()
         if "insufficient" in error_message and (
             "credits" in error_message
             or "funds" in error_message
             or "balance" in error_message
         ):
-            raise OpenRouterCreditsError(  # Keep specific credit error
+            return OpenRouterCreditsError(  # Keep specific credit error
                 "OpenRouter credits exhausted. Please add more credits to your account."
-            ) from e
-        else:
-            raise PhonosyneError(
-                f"OpenAI API error: {type(e).__name__} - {str(e)}"
-            ) from e
-    except TypeError as e:
+            )
+        return PhonosyneError(f"OpenAI API error: {type(e).__name__} - {str(e)}")
+    if isinstance(e, TypeError):
         # Handle library bug where response.choices is None (e.g., API errors, rate limits)
         if "'NoneType' object is not subscriptable" in str(e):
             logger.error(
                 "LLM provider returned an invalid response (missing choices). "
                 "This is typically caused by API errors, rate limits, or content filtering.",
-                exc_info=True,
+                exc_info=logger.isEnabledFor(logging.DEBUG),
             )
-            raise PhonosyneError(
+            return PhonosyneError(
                 "The LLM provider returned an invalid response. This could be due to "
                 "API errors, rate limits, content filtering, or insufficient credits. "
                 "Check your OpenRouter account and API status."
-            ) from e
-        raise PhonosyneError(f"Type error in Phonosyne pipeline: {str(e)}") from e
-    except Exception as e:
-        logger.error(
-            f"Unexpected error in Phonosyne pipeline: {type(e).__name__} - {str(e)}",
-            exc_info=True,
+            )
+        return PhonosyneError(f"Type error in Phonosyne pipeline: {str(e)}")
+    logger.error(
+        "Unexpected error in Phonosyne pipeline: %s - %s",
+        type(e).__name__,
+        e,
+        exc_info=logger.isEnabledFor(logging.DEBUG),
+    )
+    return PhonosyneError(
+        f"An unexpected error occurred in the Phonosyne pipeline: {type(e).__name__} - {str(e)}"
+    )
+
+
+async def run_prompts(
+    prompts: Sequence[str],
+    max_concurrency: int | None = None,
+) -> list[Any]:
+    """
+    Runs the pipeline for many briefs concurrently on one event loop.
+
+    The agents are built once per process (see `_get_orchestrator` and the
+    `phonosyne.pipeline` getters) and each brief is only a new `input`; runs
+    overlap their LLM calls, bounded by a semaphore.
+    SuperCollider renders are still serialized by the render tool.
+
+    Args:
+        prompts: The user briefs.
+        max_concurrency: Maximum number of pipeline runs in flight at once.
+                         Defaults to `settings.MAX_CONCURRENCY`.
+
+    Returns:
+        A list aligned with `prompts`, holding either the run's final output
+        or the exception it raised.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency or settings.MAX_CONCURRENCY)
+
+    async def _run_one(prompt: str) -> Any:
+        async with semaphore:
+            return await run_prompt(prompt)
+
+    return await asyncio.gather(*map(_run_one, prompts), return_exceptions=True)
+
+
+def run_prompt_sync(prompt: str, **kwargs: Any) -> Any:
+    """
+    Blocking wrapper around `run_prompt` for scripts that run many briefs one
+    after another.
+
+    Unlike calling `asyncio.run` per brief, every call on the same thread runs
+    on one long-lived event loop (uvloop when available, see `run_async`), so
+    the shared HTTP client's keep-alive connections are reused across briefs
+    instead of being re-established each time.
+
+    Must not be called from inside a running event loop; await `run_prompt`
+    there instead.
+    """
+    return run_async(run_prompt(prompt, **kwargs))
+
+
+async def analyze_sample(
+    stub: "SampleStub",
+    semaphore: asyncio.Semaphore | AdaptiveConcurrencyLimiter | None = None,
+) -> str:
+    """
+    Runs the AnalyzerAgent for one sample stub.
+
+    Transient failures (429/5xx, connection errors, unparseable replies) are
+    retried with exponential backoff and jitter, up to
+    `settings.ANALYZER_MAX_ATTEMPTS` attempts. When `settings.LLM_CACHE_ENABLED`
+    (or `settings.SEMCACHE_ENABLED`) is set, validated recipes are served from
+    and stored in the on-disk exact (or semantic) cache.
+
+    Args:
+        stub: The sample stub to analyze.
+        semaphore: Bounds concurrent analyzer calls when shared between callers
+                   (held only while a call is in flight, not during backoff).
+
+    Returns:
+        The analyzer's final output (a JSON recipe string that parses).
+
+    Raises:
+        The last error, once the attempts are used up or it is not retryable.
+    """
+    from .agents import _llm_cache, _semcache
+    from .agents.analyzer import (
+        ANALYZER_INSTRUCTIONS,
+        get_analyzer_agent,
+        parse_analyzer_output,
+    )
+
+    input_str = stub.transport_json()
+    cache_key = None
+    if settings.LLM_CACHE_ENABLED:
+        cache_key = _llm_cache.make_key(
+            settings.MODEL_ANALYZER, ANALYZER_INSTRUCTIONS, input_str
+        )
+        cached_output = _llm_cache.get(cache_key)
+        if cached_output is not None:
+            logger.info("LLM cache hit for sample %s", stub.id)
+            return cached_output
+    semantic_key = None
+    if _semcache.is_enabled():
+        semantic_key = _semcache.analyzer_key(
+            settings.MODEL_ANALYZER, ANALYZER_INSTRUCTIONS, stub
         )
-        raise PhonosyneError(
-            f"An unexpected error occurred in the Phonosyne pipeline: {type(e).__name__} - {str(e)}"
-        ) from e
+        cached_output = await _semcache.lookup(*semantic_key, f"sample {stub.id}")
+        if cached_output is not None:
+            return cached_output
+
+    analyzer_agent = get_analyzer_agent(settings.MODEL_ANALYZER)
+    run_config = RunConfig(model_provider=OPENROUTER_MODEL_PROVIDER)
+    async for attempt in llm_retrying():
+        with attempt:
+            async with semaphore or contextlib.nullcontext():
+                result = await Runner.run(
+                    starting_agent=analyzer_agent,
+                    input=input_str,
+                    run_config=run_config,
+                    hooks=DEFAULT_LOGGING_HOOKS,
+                )
+            output = result.final_output
+            # A reply that does not parse or validate is retried like a transient error.
+            parse_analyzer_output(output)
+
+    if cache_key is not None:
+        _llm_cache.put(cache_key, output)
+    if semantic_key is not None:
+        await _semcache.store(*semantic_key, output)
+    return output
+
+
+async def analyze_samples(
+    stubs: "Sequence[SampleStub]",
+    max_concurrency: int | None = None,
+) -> list[Any]:
+    """
+    Runs the AnalyzerAgent over many sample stubs concurrently (see
+    `analyze_sample`).
+
+    Each stub is an independent, I/O-bound LLM call, so the calls are overlapped
+    with `asyncio.gather` and bounded by an `AdaptiveConcurrencyLimiter` to stay
+    within provider rate limits. Failures are returned in place rather than
+    raised, so one bad stub does not cancel the rest of the batch.
+
+    Args:
+        stubs: The sample stubs (e.g., `DesignerOutput.samples`) to analyze.
+        max_concurrency: Maximum number of analyzer calls in flight at once.
+                         Defaults to `settings.MAX_CONCURRENCY`.
+
+    Returns:
+        A list aligned with `stubs`, holding either the analyzer's final output
+        (a JSON recipe string) or the exception raised for that stub.
+    """
+    limiter = AdaptiveConcurrencyLimiter(max_concurrency or settings.MAX_CONCURRENCY)
+    return await asyncio.gather(
+        *(analyze_sample(stub, limiter) for stub in stubs), return_exceptions=True
+    )
+
+
+async def sample_completions(agent: Agent, input: str, n: int) -> list[str]:
+    """
+    Draws `n` candidate replies from `agent`'s model in a single request (`n=n`),
+    so the provider prefills the system prompt once and shares it across all
+    candidates instead of paying `n` round trips and `n` prefills.
+
+    Combined with the `cache_control` marker on the system prompt (see
+    `OpenRouterChatCompletionsModel`), this is the cheapest way to sample
+    several designs or recipes for the same input. Tools and handoffs are not
+    used; the reply text of each choice is returned as is.
+
+    Args:
+        agent: The agent whose instructions, model and sampling settings to use.
+               Its `instructions` must be a string.
+        input: The user input.
+        n: The number of candidates to draw.
+
+    Returns:
+        The stripped text of each returned choice. Providers that ignore `n`
+        return a single candidate.
+    """
+    model = agent.model
+    if isinstance(model, OpenAIChatCompletionsModel):
+        model_name = model.model
+    else:
+        model_name = model or settings.DEFAULT_OPENROUTER_MODEL_NAME
+
+    messages = [
+        {"role": "system", "content": agent.instructions},
+        {"role": "user", "content": input},
+    ]
+    if supports_prompt_cache_control(model_name):
+        messages = _with_system_cache_breakpoint(messages)
+    model_settings = agent.model_settings
+    # Unset sampling parameters are omitted rather than sent as null.
+    sampling_kwargs = {
+        key: value
+        for key, value in (
+            ("temperature", model_settings.temperature),
+            ("top_p", model_settings.top_p),
+            ("frequency_penalty", model_settings.frequency_penalty),
+            ("presence_penalty", model_settings.presence_penalty),
+            ("max_tokens", model_settings.max_tokens),
+            ("extra_body", model_settings.extra_body),
+        )
+        if value is not None
+    }
+
+    async for attempt in llm_retrying():
+        with attempt:
+            completion = await openrouter_client.chat.completions.create(
+                model=model_name,
+                messages=messages,
+                n=n,
+                **sampling_kwargs,
+            )
+    return [(choice.message.content or "").strip() for choice in completion.choices]
@@ -52,6 +52,98 @@ PROMPTS_DIR: Path = Path("./prompts")
 
 # Agent & Compiler Settings
 MAX_TURNS: int = 200
+# Upper bound on concurrent per-sample LLM calls in each fan-out stage (analyzer,
+# compiler). The direct pipeline's stage limits are shared by every run on the
+# event loop, so `batch -c N` still keeps at most 2 * MAX_CONCURRENCY sub-agent
+# calls in flight. After a 429 a stage's bound is halved for
+# RATE_LIMIT_COOLDOWN_SECONDS (sdk.AdaptiveConcurrencyLimiter).
+MAX_CONCURRENCY: int = int(os.getenv("MAX_CONCURRENCY", "8"))
+
+# How run_prompt drives a run: "direct" fans the Analyzer and Compiler stages out
+# over all stubs from Python (phonosyne.pipeline); "agent" leaves the workflow
+# to the OrchestratorAgent's instructions.
+PIPELINE_MODE: str = os.getenv("PHONOSYNE_PIPELINE", "direct").lower()
+
+RATE_LIMIT_COOLDOWN_SECONDS: float = 30.0
+
+# Reply-token cap for the DesignerAgent. A one-line 24-sample plan (60-100 words per
+# seed description) needs roughly 3-3.5K tokens.
+DESIGNER_MAX_TOKENS: int = int(os.getenv("DESIGNER_MAX_TOKENS", "4096"))
+
+# Candidate plans drawn in one designer request (n=k, see sdk.sample_completions)
+# when the plan is designed without streaming; the first that parses is used.
+# Each candidate is billed as output, so 1 (a single plan) is the default.
+DESIGNER_CANDIDATES: int = int(os.getenv("DESIGNER_CANDIDATES", "1"))
+
+# Assistant/tool rounds of the compiler's repair loop resent to the model (one
+# attempt = run_supercollider_code + validate_audio_file). 0 keeps full history.
+COMPILER_HISTORY_ROUNDS: int = int(os.getenv("COMPILER_HISTORY_ROUNDS", "2"))
+
+# sclang errors returned to the compiler are cut to this many characters (head and
+# tail kept) so a huge log does not balloon every later repair prompt.
+COMPILER_MAX_ERROR_CHARS: int = int(os.getenv("COMPILER_MAX_ERROR_CHARS", "4096"))
+
+# Stubs per analyzer LLM call (AnalyzerAgent.run_batch). Above 1 the direct
+# pipeline designs the whole plan before analyzing it (no staircase streaming)
+# and bypasses the per-stub LLM/semantic caches; 1 analyzes each stub on its own.
+ANALYZER_BATCH_SIZE: int = int(os.getenv("ANALYZER_BATCH_SIZE", "1"))
+ANALYZER_MAX_ATTEMPTS: int = 5  # Attempts per stub on transient errors in analyze_samples
+
+# Analyze plans of at least BATCH_THRESHOLD stubs through OpenAI's Batch API (about
+# half the cost, but jobs may take hours). Needs OPENAI_API_KEY and an openai/ model.
+ANALYZER_BATCH_API: bool = os.getenv("PHONOSYNE_ANALYZER_BATCH_API", "0") == "1"
+BATCH_THRESHOLD: int = int(os.getenv("BATCH_THRESHOLD", "8"))
+ANALYZER_BATCH_POLL_SECONDS: float = 30.0  # Interval between batch status checks
+
+# Stream analyzer replies in the direct pipeline, so the compiler's output setup
+# starts once the recipe header has arrived and trailing text is never generated.
+ANALYZER_STREAMING: bool = os.getenv("PHONOSYNE_ANALYZER_STREAMING", "1") != "0"
+
+# Incremental (ijson) parsing of analyzer replies with early exit once all
+# required keys are read; tolerates trailing garbage after the recipe fields.
+FAST_PARSE: bool = os.getenv("PHONOSYNE_FAST_PARSE", "0") == "1"
+
+# Decode clean analyzer replies straight into a msgspec.Struct (needs `msgspec`).
+MSGSPEC_PARSE: bool = os.getenv("PHONOSYNE_MSGSPEC_PARSE", "0") == "1"
+
+# Request provider-native JSON-schema output (response_format=json_schema) from the
+# AnalyzerAgent. Off by default: not every OpenRouter-routed model supports it.
+ANALYZER_STRUCTURED_OUTPUT: bool = (
+    os.getenv("PHONOSYNE_ANALYZER_STRUCTURED_OUTPUT", "0") == "1"
+)
+
+# Same for the DesignerAgent's plan (DesignerOutput).
+DESIGNER_STRUCTURED_OUTPUT: bool = (
+    os.getenv("PHONOSYNE_DESIGNER_STRUCTURED_OUTPUT", "0") == "1"
+)
+
+# Use uvloop for the CLI's event loops when installed (see sdk.event_loop_factory).
+USE_UVLOOP: bool = os.getenv("PHONOSYNE_USE_UVLOOP", "1") != "0"
+
+# Provider-side prompt caching: send `cache_control` markers on the static system
+# prompt for providers that require explicit breakpoints (OpenAI caches automatically).
+PROMPT_CACHE_ENABLED: bool = os.getenv("PROMPT_CACHE_ENABLED", "1") != "0"
+# Comma-separated OpenRouter model-name prefixes that get explicit markers.
+PROMPT_CACHE_MODEL_PREFIXES: tuple[str, ...] = tuple(
+    prefix.strip()
+    for prefix in os.getenv(
+        "PROMPT_CACHE_MODEL_PREFIXES", "anthropic/,google/gemini"
+    ).split(",")
+    if prefix.strip()
+)
+
+# LLM Response Cache (opt-in; serves identical agent calls from disk)
+LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "0") == "1"
+LLM_CACHE_PATH: Path = DEFAULT_OUT_DIR / "llm_cache.sqlite3"
+
+# Semantic LLM cache (opt-in; serves near-identical briefs/stubs from disk). Needs
+# `sentence-transformers`; hits need a cosine similarity of at least the threshold.
+SEMCACHE_ENABLED: bool = os.getenv("SEMCACHE_ENABLED", "0") == "1"
+SEMCACHE_THRESHOLD: float = float(os.getenv("SEMCACHE_THRESHOLD", "0.92"))
+SEMCACHE_EMBEDDING_MODEL: str = os.getenv(
+    "SEMCACHE_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2"
+)
+SEMCACHE_PATH: Path = DEFAULT_OUT_DIR / "semcache.sqlite3"
 
 # API Keys - typically loaded from .env
 OPENAI_API_KEY: str | None = os.getenv("OPENAI_API_KEY")
@@ -61,6 +153,21 @@ OPENROUTER_API_KEY: str | None = os.getenv("OPENROUTER_API_KEY")
 OPENROUTER_BASE_URL: str = os.getenv(
     "OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1"
 )
+# Connection pool of the single shared HTTP client used for all OpenRouter calls.
+# HTTP/2 (multiplexing concurrent calls over one connection) needs `httpx[http2]`.
+HTTP2_ENABLED: bool = os.getenv("PHONOSYNE_HTTP2", "1") != "0"
+HTTP_MAX_CONNECTIONS: int = 64
+HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 32
+HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+# HTTP timeouts for LLM calls: fail fast on dead routes (connect/pool), but allow
+# long generations (read: completions are not streamed, so this bounds the whole
+# generation of a reply).
+LLM_CONNECT_TIMEOUT: float = float(os.getenv("LLM_CONNECT_TIMEOUT", "5.0"))
+LLM_READ_TIMEOUT: float = float(os.getenv("LLM_READ_TIMEOUT", "300.0"))
+LLM_WRITE_TIMEOUT: float = 10.0
+LLM_POOL_TIMEOUT: float = 5.0
+# Open the OpenRouter connection in the background at the start of run_prompt.
+PREWARM_LLM_CONNECTION: bool = os.getenv("PREWARM_LLM_CONNECTION", "1") != "0"
 # You can set a preferred default model via environment variable,
 # or change the fallback string literal below.
 DEFAULT_OPENROUTER_MODEL_NAME: str = os.getenv(
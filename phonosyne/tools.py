@@ -19,9 +19,12 @@
 - - Docstrings of tool functions serve as their descriptions for the calling agents.
 """
 
+import asyncio
+import hashlib
 import json
 import logging  # Added
 import shutil
+import threading
 from pathlib import Path
 
 from agents import function_tool
@@ -38,6 +41,13 @@ from phonosyne.agents.schemas import (  # Add other schemas as they become neces
 # Import specific utilities needed for the tools
 from phonosyne.utils.exec_env import (
     CodeExecutionError,
+    SclangScriptError,
+)
+from phonosyne.utils.string_utils import (
+    dumps_json,
+    extract_code_block,
+    loads_json,
+    truncate_middle,
 )
 from phonosyne.utils.exec_env import (
     run_supercollider_code as existing_run_supercollider_code,
@@ -47,7 +57,58 @@ logger = logging.getLogger(__name__)  # Added
 
 # Determine Project Root and Output Directory for executed code
 EXEC_ENV_OUTPUT_DIR = Path(app_settings.DEFAULT_OUT_DIR).resolve() / "exec_env_output"
-logger.info(f"Execution environment output directory set to: {EXEC_ENV_OUTPUT_DIR}")
+logger.info("Execution environment output directory set to: %s", EXEC_ENV_OUTPUT_DIR)
+
+# sclang renders against one shared scsynth over fixed OSC ports (57120/57110),
+# so only one script may run at a time. Renders are serialized, but run in a
+# worker thread so other samples' LLM calls keep progressing meanwhile. The lock
+# is a threading.Lock taken in that worker, not an asyncio.Lock: callers run on
+# several event loops (one per thread, see `sdk.run_async`), and an asyncio.Lock
+# would bind to the first of them.
+_SCLANG_LOCK = threading.Lock()
+
+# output_filename -> (digest of the last script that failed, its error message).
+# A model stuck in a repair fixed point resubmits the same script; that error is
+# replayed instead of re-running sclang for a known outcome. Output paths are
+# unique per compilation (see `compiler.wip_wav_path`), so entries never leak
+# between samples or runs. Only script errors are recorded: a timeout or a
+# server failure may well pass on a retry. Oldest entries are evicted first.
+_last_failed_render: dict[str, tuple[bytes, str]] = {}
+_MAX_FAILED_RENDERS = 256
+
+
+def _code_digest(code: str) -> bytes:
+    return hashlib.blake2b(code.encode(), digest_size=8).digest()
+
+
+async def render_supercollider(
+    code: str, output_filename: str, effect_name: str, duration: float
+) -> Path:
+    """
+    Renders a SuperCollider script to `output_filename`, one render at a time,
+    in a worker thread. The rendering half of the `run_supercollider_code` tool.
+
+    Raises:
+        CodeExecutionError: If sclang fails or the script errors.
+        FileNotFoundError: If sclang cannot be found.
+    """
+    # existing_run_supercollider_code is synchronous and blocks for at least
+    # the recipe duration; the SDK awaits async tools on the event loop, so
+    # it is moved to a thread here.
+    return await asyncio.to_thread(
+        _render_serialized,
+        code=code,
+        output_filename=output_filename,
+        duration=duration,
+        effect_name=effect_name,
+    )
+
+
+def _render_serialized(**kwargs) -> Path:
+    """Runs `existing_run_supercollider_code` while holding `_SCLANG_LOCK`."""
+    with _SCLANG_LOCK:
+        # sclang_path will use its default from existing_run_supercollider_code
+        return existing_run_supercollider_code(**kwargs)
 
 
 @function_tool
@@ -73,27 +134,55 @@ async def run_supercollider_code(
         Absolute path to the .wav file on success, or an error message string.
     """
     logger.info(
-        f"run_supercollider_code: output_filename='{output_filename}', effect_name='{effect_name}', duration='{duration}'"
+        "run_supercollider_code: output_filename='%s', effect_name='%s', duration='%s'",
+        output_filename,
+        effect_name,
+        duration,
     )
-    code_to_log = code[:500] + "..." if len(code) > 500 else code
-    logger.debug(f"Code (first 500 chars):\n{code_to_log}")
+    if "```" in code:
+        # Models sometimes pass the script wrapped in markdown fences, which
+        # sclang cannot interpret; run only the fenced body.
+        code = extract_code_block(code) or code
+    if logger.isEnabledFor(logging.DEBUG):
+        code_to_log = code[:500] + "..." if len(code) > 500 else code
+        logger.debug("Code (first 500 chars):\n%s", code_to_log)
+
+    code_digest = _code_digest(code)
+    last_failure = _last_failed_render.get(output_filename)
+    if last_failure is not None and last_failure[0] == code_digest:
+        logger.warning(
+            "run_supercollider_code: '%s' resubmitted an identical failing script; "
+            "not re-running it",
+            effect_name,
+        )
+        return (
+            f"{last_failure[1]}\n"
+            "This script is identical to the previous failed attempt and was not "
+            "run again. Change the code to address the error above."
+        )
 
     try:
-        # existing_run_supercollider_code is synchronous.
-        # The agents SDK's @function_tool and runner should handle
-        # running this in a way that doesn't block the event loop (e.g. thread pool).
-        wav_path_obj = existing_run_supercollider_code(
+        wav_path_obj = await render_supercollider(
             code=code,
             output_filename=output_filename,  # This is the absolute path
-            duration=duration,
             effect_name=effect_name,
-            # sclang_path will use its default from existing_run_supercollider_code
+            duration=duration,
         )
-        logger.info(f"run_supercollider_code successfully produced: {wav_path_obj}")
+        logger.info("run_supercollider_code successfully produced: %s", wav_path_obj)
+        _last_failed_render.pop(output_filename, None)
         return str(wav_path_obj)
     except CodeExecutionError as e:  # Make sure CodeExecutionError is imported
         err_msg = f"CodeExecutionError from existing_run_supercollider_code: {str(e)}"
-        logger.error(err_msg, exc_info=True)
+        # Expected during the compiler's repair loop (the error text is returned to
+        # the agent and retried), so the traceback is only formatted at DEBUG.
+        logger.error(err_msg, exc_info=logger.isEnabledFor(logging.DEBUG))
+        # The full sclang output is logged above; the agent gets a bounded copy.
+        err_msg = truncate_middle(err_msg, app_settings.COMPILER_MAX_ERROR_CHARS)
+        if isinstance(e, SclangScriptError):
+            _last_failed_render.pop(output_filename, None)  # Re-insert as newest.
+            _last_failed_render[output_filename] = (code_digest, err_msg)
+            if len(_last_failed_render) > _MAX_FAILED_RENDERS:
+                del _last_failed_render[next(iter(_last_failed_render))]
         return err_msg
     except (
         FileNotFoundError
@@ -135,9 +224,12 @@ async def validate_audio_file(file_path: str, effect_name: str, duration: float)
         if not abs_file_path.exists():
             return f"Validation error: Audio file does not exist at {abs_file_path} (from {file_path})"
 
-        # existing_validate_wav is synchronous. Assuming openai-agents SDK handles this.
-        existing_validate_wav(
-            file_path=abs_file_path, effect_name=effect_name, duration=duration
+        # existing_validate_wav is synchronous (reads and analyzes the file).
+        await asyncio.to_thread(
+            existing_validate_wav,
+            file_path=abs_file_path,
+            effect_name=effect_name,
+            duration=duration,
         )
         print(f"Audio file at {abs_file_path} successfully validated")
         return "Validation successful"
@@ -170,19 +262,21 @@ async def move_file(source_path: str, target_path: str) -> str:
         source = Path(source_path)
         if not source.is_absolute():
             logger.warning(
-                f"move_file: Received relative source_path '{source_path}'. Resolving it to an absolute path."
+                "move_file: Received relative source_path '%s'. Resolving it to an absolute path.",
+                source_path,
             )
             source = source.resolve()
 
         target = Path(target_path)
         if not target.is_absolute():
             logger.warning(
-                f"move_file: Received relative target_path '{target_path}'. Resolving it to an absolute path."
+                "move_file: Received relative target_path '%s'. Resolving it to an absolute path.",
+                target_path,
             )
             target = target.resolve()
 
-        logger.info(f"Attempting to move file from (resolved absolute): {source}")
-        logger.info(f"Attempting to move file to   (resolved absolute): {target}")
+        logger.info("Attempting to move file from (resolved absolute): %s", source)
+        logger.info("Attempting to move file to   (resolved absolute): %s", target)
 
         # Critical Check: Source file must exist and be a file.
         if not source.exists():
@@ -280,15 +374,22 @@ async def generate_manifest_file(manifest_data_json: str, output_directory: str)
 
         if first_char_index != -1:
             json_string_to_decode = content_to_parse[first_char_index:]
-            # Use raw_decode to parse the first valid JSON object and ignore trailing data
-            decoder = json.JSONDecoder()
-            parsed_data, _ = decoder.raw_decode(json_string_to_decode)
+            try:
+                # Fast path (orjson when installed) for a clean JSON document.
+                parsed_data = loads_json(json_string_to_decode)
+            except ValueError:
+                # Use raw_decode to parse the first valid JSON object and ignore trailing data
+                decoder = json.JSONDecoder()
+                parsed_data, _ = decoder.raw_decode(json_string_to_decode)
         else:
             # If no JSON start character is found, this will likely fail, but try anyway
-            parsed_data = json.loads(content_to_parse)
+            parsed_data = loads_json(content_to_parse)
 
-        with open(manifest_file_path, "w", encoding="utf-8") as f:
-            json.dump(parsed_data, f, indent=2)
+        # Serialized in one call (orjson when installed) and written in one go,
+        # rather than json.dump's many small writes.
+        manifest_file_path.write_text(
+            dumps_json(parsed_data, indent=True), encoding="utf-8"
+        )
         return f"Manifest generated successfully at {str(manifest_file_path)}"
     except json.JSONDecodeError as e:
         # Log the original input string for better debugging if raw_decode also fails
@@ -20,7 +20,16 @@ from .exec_env import SecurityException, run_supercollider_code
 
 # TODO: Import slugify from .slugify once implemented
 from .slugify import slugify
-from .string_utils import extract_and_parse_json, extract_json_from_text
+from .string_utils import (
+    JsonArrayItemScanner,
+    JsonObjectEndScanner,
+    dumps_json,
+    extract_and_parse_json,
+    extract_code_block,
+    extract_json_from_text,
+    loads_json,
+    truncate_middle,
+)
 
 __all__ = [
     "slugify",
@@ -28,4 +37,10 @@ __all__ = [
     "SecurityException",
     "extract_json_from_text",
     "extract_and_parse_json",
+    "extract_code_block",
+    "loads_json",
+    "dumps_json",
+    "truncate_middle",
+    "JsonArrayItemScanner",
+    "JsonObjectEndScanner",
 ]
@@ -7,6 +7,7 @@ It also includes functionality to run SuperCollider code, now with an OSC-based
 
 Key features:
 - `run_python_code` function to execute a string of Python code (if you have one).
+- `SclangScriptError` marks failures caused by the script itself.
 - `run_supercollider_code` function to:
     - Start `scsynth` (SuperCollider server).
     - Start `sclang` with a user-provided script that defines SynthDefs and OSC handlers.
@@ -44,6 +45,11 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 SCLANG_READY_SIGNAL = "Phonosyne SuperCollider script ready"
+# Error keywords that point at the submitted script rather than at the server
+# or the sclang process (see `SclangScriptError`).
+_SCRIPT_ERROR_KEYWORDS = frozenset(
+    ("error:", "doesnotunderstanderror", "exception:", "syntax error", "parse failed")
+)
 
 
 class CodeExecutionError(Exception):
@@ -52,6 +58,16 @@ class CodeExecutionError(Exception):
     pass
 
 
+class SclangScriptError(CodeExecutionError):
+    """
+    The submitted script itself failed (sclang reported an error while
+    interpreting it), as opposed to a timeout or a startup/server failure.
+    Running the same script again fails the same way.
+    """
+
+    pass
+
+
 class SecurityException(CodeExecutionError):  # Keep for compatibility if used elsewhere
     """Custom exception for security-related issues."""
 
@@ -102,14 +118,18 @@ def run_supercollider_code(
         )
 
     logger.info(
-        f"Initiating SuperCollider OSC-controlled execution for: '{output_filename}'"
+        "Initiating SuperCollider OSC-controlled execution for: '%s'",
+        output_filename,
     )
-    logger.debug(f"Target duration: {duration}s, Effect name: {effect_name}")
+    logger.debug("Target duration: %ss, Effect name: %s", duration, effect_name)
     logger.debug(
-        f"sclang: {sclang_executable_path}, scsynth: {scsynth_executable_path}"
+        "sclang: %s, scsynth: %s", sclang_executable_path, scsynth_executable_path
     )
     logger.debug(
-        f"sclang OSC: {sclang_osc_host}:{sclang_osc_port}, scsynth UDP: {scsynth_udp_port}"
+        "sclang OSC: %s:%s, scsynth UDP: %s",
+        sclang_osc_host,
+        sclang_osc_port,
+        scsynth_udp_port,
     )
 
     actual_wav_path = Path(output_filename)
@@ -120,9 +140,12 @@ def run_supercollider_code(
 
     try:
         actual_wav_path.parent.mkdir(parents=True, exist_ok=True)
+        # Repair attempts render over the same path; a file left by an earlier
+        # attempt must not pass the existence check after a failed render.
+        actual_wav_path.unlink(missing_ok=True)
     except OSError as e:
         raise CodeExecutionError(
-            f"Could not create parent directory {actual_wav_path.parent}: {e}"
+            f"Could not prepare output path {actual_wav_path}: {e}"
         ) from e
 
     sclang_proc = None
@@ -149,16 +172,20 @@ def run_supercollider_code(
         # scsynth is assumed to be running externally.
         # Python will now only manage the sclang process.
         logger.info(
-            f"Assuming scsynth is running externally and listening on UDP port: {scsynth_udp_port}"
+            "Assuming scsynth is running externally and listening on UDP port: %s",
+            scsynth_udp_port,
         )
         sclang_stdout_acc = []  # Initialize here as scsynth monitoring block is removed
         sclang_stderr_acc = []
         sclang_setup_error_message = None
+        script_error_detected = False
 
         # 1. Start sclang and send the script via stdin (was step 2)
         logger.info("Preparing to start sclang and send script via stdin.")
         logger.info(
-            f"sclang should listen for OSC on {sclang_osc_host}:{sclang_osc_port}"
+            "sclang should listen for OSC on %s:%s",
+            sclang_osc_host,
+            sclang_osc_port,
         )
 
         # The SC 'code' must be adapted for this OSC model.
@@ -168,18 +195,20 @@ def run_supercollider_code(
         # We could prepend this, but it's better if the user's script is aware.
         # For now, assume user's script handles its listening port or uses default 57120.
 
-        script_content_preview_lines = code.splitlines()[:10]
-        script_content_preview = "\\n".join(script_content_preview_lines)
-        logger.debug(
-            f"Preview of SC script content (up to 10 lines):\\n{script_content_preview.strip()}"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            script_content_preview_lines = code.splitlines()[:10]
+            script_content_preview = "\\n".join(script_content_preview_lines)
+            logger.debug(
+                "Preview of SC script content (up to 10 lines):\\n%s",
+                script_content_preview.strip(),
+            )
 
         sclang_cmd = [sclang_executable_path]  # No script file argument
         env = os.environ.copy()
         env["LANG"] = "en_US.UTF-8"  # Ensure consistent encoding for sclang
         env["LC_ALL"] = "en_US.UTF-8"
 
-        logger.info(f"Executing sclang command: {' '.join(sclang_cmd)}")
+        logger.info("Executing sclang command: %s", " ".join(sclang_cmd))
         try:
             sclang_proc = subprocess.Popen(
                 sclang_cmd,
@@ -193,7 +222,7 @@ def run_supercollider_code(
                 env=env,
                 start_new_session=True,  # Ensure sclang runs in its own session
             )
-            logger.info(f"sclang started with PID: {sclang_proc.pid}")
+            logger.info("sclang started with PID: %s", sclang_proc.pid)
 
             # Send the SuperCollider code to sclang's stdin
             if sclang_proc.stdin:
@@ -210,11 +239,10 @@ def run_supercollider_code(
                 )
                 logger.debug("Writing SC server configuration to sclang stdin...")
                 sclang_proc.stdin.write(server_config_sc_code)
-                sclang_proc.stdin.flush()
-                logger.debug("SC server configuration written and flushed.")
+                logger.debug("SC server configuration written.")
 
-                # Brief pause for sclang to process the server configuration.
-                time.sleep(0.5)  # May need adjustment
+                # No pause needed before the user script: sclang evaluates the
+                # form-feed-terminated blocks from stdin strictly in order.
 
                 # Part 2: Send the user's actual script (variable 'code'), wrapped in .interpret
                 logger.debug("Preparing user's SC script for '.interpret' execution...")
@@ -225,13 +253,17 @@ def run_supercollider_code(
                 code_to_process = code
 
                 # Log a preview of the script that will be escaped and interpreted
-                processed_script_preview_lines = code_to_process.splitlines()[
-                    :5
-                ]  # Show first 5 lines
-                processed_script_preview = "\\n".join(processed_script_preview_lines)
-                logger.debug(
-                    f"Preview of SC script to be interpreted (after potential placeholder replacement, up to 5 lines):\\n{processed_script_preview.strip()}"
-                )
+                if logger.isEnabledFor(logging.DEBUG):
+                    processed_script_preview_lines = code_to_process.splitlines()[
+                        :5
+                    ]  # Show first 5 lines
+                    processed_script_preview = "\\n".join(
+                        processed_script_preview_lines
+                    )
+                    logger.debug(
+                        "Preview of SC script to be interpreted (after potential placeholder replacement, up to 5 lines):\\n%s",
+                        processed_script_preview.strip(),
+                    )
 
                 escaped_user_code = (
                     code_to_process.replace("\\", "\\\\")
@@ -249,10 +281,10 @@ def run_supercollider_code(
             else:
                 raise CodeExecutionError("sclang process stdin is not available.")
 
-            # Initial check for immediate sclang errors or exit after sending both parts.
-            # The previous sleep(1.0) was after the combined send. Now it's effectively after the second send.
-            # Let's keep a similar delay here to check for early exit.
-            time.sleep(0.75)  # Adjusted from 1.0, as 0.5 was already used mid-way.
+            # Cheap check for sclang having exited already (e.g. a bad binary).
+            # No grace period is waited out here: the setup monitor below polls
+            # for a premature exit anyway, so fixed sleeps only added latency to
+            # every compile attempt.
             if sclang_proc.poll() is not None:  # sclang has already exited
                 sclang_initial_stdout, sclang_initial_stderr = sclang_proc.communicate(
                     timeout=5
@@ -332,29 +364,37 @@ def run_supercollider_code(
                         log_level = logging.INFO if is_stdout else logging.WARNING
                         logger.log(
                             log_level,
-                            f"sclang {'STDOUT' if is_stdout else 'STDERR'} (setup): {line_str}",
+                            "sclang %s (setup): %s",
+                            "STDOUT" if is_stdout else "STDERR",
+                            line_str,
                         )
 
                         if is_stdout:
                             if SCLANG_READY_SIGNAL in line_str:
                                 logger.info(
-                                    f"Detected sclang ready signal: '{SCLANG_READY_SIGNAL}'"
+                                    "Detected sclang ready signal: '%s'",
+                                    SCLANG_READY_SIGNAL,
                                 )
                                 initial_setup_phase_done = True
                             elif "SC_LOG: Preparing for record" in line_str:
                                 logger.info(
-                                    f"Detected implicit ready signal (script running): '{line_str}'"
+                                    "Detected implicit ready signal (script running): '%s'",
+                                    line_str,
                                 )
                                 initial_setup_phase_done = True
                             elif "Preparing recording on" in line_str:
                                 logger.info(
-                                    f"Detected implicit ready signal (standard SC output): '{line_str}'"
+                                    "Detected implicit ready signal (standard SC output): '%s'",
+                                    line_str,
                                 )
                                 initial_setup_phase_done = True
 
                         for keyword in error_keywords_lower:
                             if keyword in line_str.lower():
                                 sclang_setup_error_message = f"Error keyword '{keyword}' in sclang output: {line_str}"
+                                script_error_detected = (
+                                    keyword in _SCRIPT_ERROR_KEYWORDS
+                                )
                                 logger.error(sclang_setup_error_message)
                                 break
                         if sclang_setup_error_message:
@@ -364,7 +404,8 @@ def run_supercollider_code(
                     pass  # Expected with non-blocking reads if readline has nothing.
                 except Exception as e_read:
                     logger.warning(
-                        f"Exception reading from sclang during setup: {e_read}"
+                        "Exception reading from sclang during setup: %s",
+                        e_read,
                     )
                     sclang_setup_error_message = f"Read exception: {e_read}"
                     break
@@ -413,7 +454,10 @@ def run_supercollider_code(
                 + (sclang_final_stderr_communicate or "")
             )
 
-            raise CodeExecutionError(
+            error_type = (
+                SclangScriptError if script_error_detected else CodeExecutionError
+            )
+            raise error_type(
                 f"Failed to set up sclang script: {sclang_setup_error_message}\\n"
                 f"sclang STDOUT: {full_stdout.strip()}\\n"
                 f"sclang STDERR: {full_stderr.strip()}"
@@ -451,7 +495,9 @@ def run_supercollider_code(
         # OSCdef(\\stop, { /* stop recording, free synth */ }, '/phonosyne/stop');
 
         logger.info(
-            f"Sending /phonosyne/render OSC message to sclang ({sclang_osc_host}:{sclang_osc_port})"
+            "Sending /phonosyne/render OSC message to sclang (%s:%s)",
+            sclang_osc_host,
+            sclang_osc_port,
         )
         render_msg_builder = osc_message_builder.OscMessageBuilder(
             address="/phonosyne/render"
@@ -461,7 +507,8 @@ def run_supercollider_code(
         osc_client.send(render_msg_builder.build())
 
         logger.info(
-            f"Waiting for recipe duration ({safe_duration}s) while sclang/scsynth operate..."
+            "Waiting for recipe duration (%ss) while sclang/scsynth operate...",
+            safe_duration,
         )
 
         # Monitor sclang output and overall timeout during recipe duration
@@ -477,7 +524,8 @@ def run_supercollider_code(
                 break
             if sclang_proc.poll() is not None:
                 logger.error(
-                    f"sclang process terminated unexpectedly during recipe execution (exit code {sclang_proc.returncode})."
+                    "sclang process terminated unexpectedly during recipe execution (exit code %s).",
+                    sclang_proc.returncode,
                 )
                 sclang_final_stdout_recipe, sclang_final_stderr_recipe = (
                     sclang_proc.communicate(timeout=5)
@@ -512,13 +560,16 @@ def run_supercollider_code(
                             )
                             current_buffer_acc.append(line_str)
                             logger.info(
-                                f"sclang {'STDOUT' if is_stdout else 'STDERR'} (recipe): {line_str}"
+                                "sclang %s (recipe): %s",
+                                "STDOUT" if is_stdout else "STDERR",
+                                line_str,
                             )
                 except BlockingIOError:
                     pass
                 except Exception as e_read_recipe:
                     logger.warning(
-                        f"Exception reading from sclang during recipe: {e_read_recipe}"
+                        "Exception reading from sclang during recipe: %s",
+                        e_read_recipe,
                     )
 
         if timed_out_during_recipe:
@@ -527,7 +578,9 @@ def run_supercollider_code(
             )
 
         logger.info(
-            f"Recipe duration elapsed. Sending /phonosyne/stop OSC message to sclang ({sclang_osc_host}:{sclang_osc_port})"
+            "Recipe duration elapsed. Sending /phonosyne/stop OSC message to sclang (%s:%s)",
+            sclang_osc_host,
+            sclang_osc_port,
         )
         stop_msg_builder = osc_message_builder.OscMessageBuilder(
             address="/phonosyne/stop"
@@ -539,14 +592,16 @@ def run_supercollider_code(
             settings, "SCLANG_STOP_PROCESSING_TIME_SECONDS", 5.0
         )
         logger.info(
-            f"Waiting {stop_processing_time}s for sclang to process stop and finalize recording..."
+            "Waiting %ss for sclang to process stop and finalize recording...",
+            stop_processing_time,
         )
 
         stop_wait_start_time = time.monotonic()
         while time.monotonic() < stop_wait_start_time + stop_processing_time:
             if sclang_proc.poll() is not None:
                 logger.warning(
-                    f"sclang process terminated during stop processing time (exit code {sclang_proc.returncode})."
+                    "sclang process terminated during stop processing time (exit code %s).",
+                    sclang_proc.returncode,
                 )
                 break  # sclang already exited, no need to wait further
 
@@ -568,13 +623,16 @@ def run_supercollider_code(
                             current_buffer_acc.append(line_str)
                             logger.log(
                                 logging.INFO if is_stdout else logging.WARNING,
-                                f"sclang {'STDOUT' if is_stdout else 'STDERR'} (post-stop): {line_str}",
+                                "sclang %s (post-stop): %s",
+                                "STDOUT" if is_stdout else "STDERR",
+                                line_str,
                             )
                 except BlockingIOError:
                     pass
                 except Exception as e_drain:
                     logger.warning(
-                        f"Exception draining sclang output post-stop: {e_drain}"
+                        "Exception draining sclang output post-stop: %s",
+                        e_drain,
                     )
                     break  # Stop trying to drain if error
 
@@ -586,10 +644,12 @@ def run_supercollider_code(
         raise CodeExecutionError(
             f"Failed to build OSC message: {e_osc_build}"
         ) from e_osc_build
+    except SclangScriptError:
+        raise  # Already cleaned up; keep the type so callers can tell it apart.
     except Exception as e_general:
         # Ensure processes are cleaned up if an unexpected error occurs mid-flight
         if sclang_proc and sclang_proc.poll() is None:
-            logger.warning(f"Terminating sclang due to exception: {e_general}")
+            logger.warning("Terminating sclang due to exception: %s", e_general)
             sclang_proc.terminate()
             try:
                 sclang_proc.wait(timeout=5)
@@ -605,26 +665,30 @@ def run_supercollider_code(
 
         # Terminate sclang first
         if sclang_proc and sclang_proc.poll() is None:
-            logger.info(f"Terminating sclang process (PID: {sclang_proc.pid})...")
+            logger.info("Terminating sclang process (PID: %s)...", sclang_proc.pid)
             sclang_proc.terminate()
             try:
                 sclang_proc.wait(timeout=settings.SCLANG_TERMINATE_TIMEOUT_SECONDS)
-                logger.info(f"sclang process (PID: {sclang_proc.pid}) terminated.")
+                logger.info("sclang process (PID: %s) terminated.", sclang_proc.pid)
             except subprocess.TimeoutExpired:
                 logger.warning(
-                    f"sclang process (PID: {sclang_proc.pid}) did not terminate gracefully, killing."
+                    "sclang process (PID: %s) did not terminate gracefully, killing.",
+                    sclang_proc.pid,
                 )
                 sclang_proc.kill()
                 try:
                     sclang_proc.wait(timeout=settings.SCLANG_KILL_TIMEOUT_SECONDS)
-                    logger.info(f"sclang process (PID: {sclang_proc.pid}) killed.")
+                    logger.info("sclang process (PID: %s) killed.", sclang_proc.pid)
                 except subprocess.TimeoutExpired:
                     logger.error(
-                        f"sclang process (PID: {sclang_proc.pid}) failed to die even after kill."
+                        "sclang process (PID: %s) failed to die even after kill.",
+                        sclang_proc.pid,
                     )
         elif sclang_proc:
             logger.info(
-                f"sclang process (PID: {sclang_proc.pid}) already terminated with code: {sclang_proc.returncode}."
+                "sclang process (PID: %s) already terminated with code: %s.",
+                sclang_proc.pid,
+                sclang_proc.returncode,
             )
 
         # Capture any final output from sclang
@@ -642,12 +706,16 @@ def run_supercollider_code(
                         try:
                             # Attempt to log the error message as a string
                             logger.warning(
-                                f"Error reading final sclang {stream_name}: {str(e_read_final)}"
+                                "Error reading final sclang %s: %s",
+                                stream_name,
+                                str(e_read_final),
                             )
                         except Exception as log_e:
                             # Fallback if even string conversion of error fails
                             logger.warning(
-                                f"Error reading final sclang {stream_name}, and also failed to log original exception: {log_e}"
+                                "Error reading final sclang %s, and also failed to log original exception: %s",
+                                stream_name,
+                                log_e,
                             )
 
         sclang_final_stdout = (
@@ -658,9 +726,9 @@ def run_supercollider_code(
         )
 
         if sclang_final_stdout:
-            logger.debug(f"Final accumulated sclang STDOUT:\\n{sclang_final_stdout}")
+            logger.debug("Final accumulated sclang STDOUT:\\n%s", sclang_final_stdout)
         if sclang_final_stderr:
-            logger.debug(f"Final accumulated sclang STDERR:\\n{sclang_final_stderr}")
+            logger.debug("Final accumulated sclang STDERR:\\n%s", sclang_final_stderr)
 
         # Attempt to quit scsynth via OSC first, then terminate/kill process
         # scsynth process management is removed from this finally block.
@@ -686,6 +754,7 @@ def run_supercollider_code(
         )
 
     logger.info(
-        f"Successfully produced WAV file via OSC-controlled SuperCollider: {actual_wav_path}"
+        "Successfully produced WAV file via OSC-controlled SuperCollider: %s",
+        actual_wav_path,
     )
     return actual_wav_path
@@ -11,20 +11,31 @@ Key features:
 - Removes non-alphanumeric characters (except hyphens).
 - Handles multiple consecutive hyphens.
 - Trims leading/trailing hyphens.
+- Results are memoized (`functools.lru_cache`), since the same effect names and
+  briefs are slugified repeatedly within and across runs.
 
 @dependencies
 - `re` (Python's regular expression module).
 - `unicodedata` for handling Unicode characters by normalizing them.
+- `functools` for memoization.
 
 @notes
 - This is a simple ASCII-focused slugify function. For more complex internationalization
   requirements, a more robust library might be needed.
 """
 
+import functools
 import re
 import unicodedata
 
+_NON_WORD_RE = re.compile(r"[^\w\s-]")
+_HYPHEN_SPACE_RE = re.compile(r"[-\s]+")
+_EDGE_HYPHEN_RE = re.compile(r"^-+|-+$")
+# Strings that slugify would return unchanged (e.g., effect names an LLM already slugified).
+_SLUG_RE = re.compile(r"[a-z0-9_]+(?:-[a-z0-9_]+)*")
 
+
+@functools.lru_cache(maxsize=1024)
 def slugify(value: str, allow_unicode: bool = False) -> str:
     """
     Convert a string to a slug.
@@ -43,6 +54,8 @@ def slugify(value: str, allow_unicode: bool = False) -> str:
         The slugified string.
     """
     value = str(value)
+    if _SLUG_RE.fullmatch(value):
+        return value
     if allow_unicode:
         value = unicodedata.normalize("NFKC", value)
     else:
@@ -52,9 +65,9 @@ def slugify(value: str, allow_unicode: bool = False) -> str:
             .decode("ascii")
         )
 
-    value = re.sub(r"[^\w\s-]", "", value).strip().lower()
-    value = re.sub(r"[-\s]+", "-", value)
-    value = re.sub(r"^-+|-+$", "", value)  # remove leading/trailing hyphens
+    value = _NON_WORD_RE.sub("", value).strip().lower()
+    value = _HYPHEN_SPACE_RE.sub("-", value)
+    value = _EDGE_HYPHEN_RE.sub("", value)  # remove leading/trailing hyphens
     return value
 
 
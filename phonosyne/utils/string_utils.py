@@ -8,6 +8,198 @@ import json
 import re
 from typing import Any, Dict, Optional
 
+# orjson is an optional speedup; fall back to the stdlib parser when it is absent.
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional language tag on a code fence's opening line (e.g. "supercollider").
+_LANG_TAG_RE = re.compile(r"[\w+-]*")
+# Content within ```json ... ``` or ``` ... ``` fences (non-greedy, shortest block).
+_FENCED_JSON_RE = re.compile(r"```(?:json)?\s*\n?(.*?)\n?```", re.DOTALL | re.IGNORECASE)
+
+
+def loads_json(data: str | bytes) -> Any:
+    """
+    Parses a JSON document, using `orjson` when it is installed.
+
+    Args:
+        data: The JSON document as `str` or UTF-8 `bytes`.
+
+    Returns:
+        The parsed Python object.
+
+    Raises:
+        ValueError: If `data` is not valid JSON (both `orjson.JSONDecodeError`
+                    and `json.JSONDecodeError` subclass `ValueError`).
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_json(obj: Any, indent: bool = False) -> str:
+    """
+    Serializes `obj` to a JSON string, using `orjson` when it is installed.
+
+    Args:
+        obj: A JSON-compatible Python object.
+        indent: Pretty-print with two-space indentation.
+
+    Returns:
+        The JSON document. Non-ASCII characters are written as-is (UTF-8)
+        rather than as `\\u` escapes.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            option = orjson.OPT_INDENT_2 if indent else 0
+            return orjson.dumps(obj, option=option).decode()
+        except TypeError:
+            # orjson rejects e.g. integers beyond 64 bits; json handles them.
+            pass
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False)
+
+
+def truncate_middle(text: str, max_chars: int) -> str:
+    """
+    Shortens `text` to about `max_chars` by cutting out its middle, keeping the
+    start and end (for tracebacks and tool logs, where both the first error and
+    the final lines matter).
+
+    Args:
+        text: The text to shorten.
+        max_chars: Maximum number of characters kept from `text`.
+
+    Returns:
+        `text` unchanged if it fits, otherwise its head and tail joined by a
+        truncation marker.
+    """
+    if len(text) <= max_chars:
+        return text
+    head = max_chars // 2
+    tail = max_chars - head
+    marker = f"\n...[truncated {len(text) - max_chars} chars]...\n"
+    return text[:head] + marker + text[-tail:]
+
+
+class JsonObjectEndScanner:
+    """
+    Tracks brace depth over streamed text (ignoring braces inside JSON strings)
+    to detect when the first top-level JSON object has been closed.
+    """
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, chunk: str) -> bool:
+        """Consumes `chunk`; returns True once the outermost object has closed."""
+        for char in chunk:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = self.depth > 0
+            elif char == "{":
+                self.depth += 1
+            elif char == "}" and self.depth > 0:
+                self.depth -= 1
+                if self.depth == 0:
+                    return True
+        return False
+
+
+class JsonArrayItemScanner:
+    """
+    Pulls the objects of a JSON array field (e.g. a plan's "samples") out of
+    streamed text, yielding each object's source as soon as it closes, so work
+    on the first items can start while the rest is still being generated.
+    """
+
+    def __init__(self, key: str) -> None:
+        self._array_start_re = re.compile(rf'"{re.escape(key)}"\s*:\s*\[')
+        self._prefix = ""  # Text seen before the array opened.
+        self._in_array = False
+        self._done = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._item: list[str] = []
+
+    def feed(self, chunk: str) -> list[str]:
+        """Consumes `chunk`; returns the source of every item that closed in it."""
+        if self._done:
+            return []
+        if not self._in_array:
+            self._prefix += chunk
+            match = self._array_start_re.search(self._prefix)
+            if match is None:
+                return []
+            self._in_array = True
+            chunk = self._prefix[match.end() :]
+            self._prefix = ""
+
+        items: list[str] = []
+        for char in chunk:
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                    self._item.append(char)
+                elif char == "]":
+                    self._done = True
+                    break
+                continue
+            self._item.append(char)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    items.append("".join(self._item))
+                    self._item.clear()
+        return items
+
+
+def extract_code_block(text: str) -> Optional[str]:
+    """
+    Extracts the body of the first markdown-fenced code block
+    (e.g., ```supercollider ... ``` or ``` ... ```).
+
+    Args:
+        text: The input string that may contain a fenced code block.
+
+    Returns:
+        The stripped code inside the fences, or None if there is no complete block.
+    """
+    # Two linear str.find scans instead of a lazy DOTALL regex, which backtracks
+    # badly on long replies whose closing fence is missing.
+    start = text.find("```")
+    if start < 0:
+        return None
+    body_start = start + 3
+    line_end = text.find("\n", body_start)
+    if line_end >= 0 and _LANG_TAG_RE.fullmatch(text, body_start, line_end):
+        body_start = line_end + 1
+    end = text.find("```", body_start)
+    return text[body_start:end].strip() if end >= 0 else None
+
 
 def extract_json_from_text(text: str) -> Optional[str]:
     """
@@ -23,14 +215,14 @@ def extract_json_from_text(text: str) -> Optional[str]:
     # Regex to find content within ```json ... ``` or ``` ... ```
     # It handles optional "json" and captures the content inside.
     # It's non-greedy (.*?) to match the shortest possible block.
-    match = re.search(r"```(?:json)?\s*\n?(.*?)\n?```", text, re.DOTALL | re.IGNORECASE)
+    match = _FENCED_JSON_RE.search(text)
     if match:
         json_str = match.group(1).strip()
         # Basic validation: try to parse it
         try:
-            json.loads(json_str)
+            loads_json(json_str)
             return json_str
-        except json.JSONDecodeError:
+        except ValueError:
             # If it's not valid JSON, perhaps it's a more complex case or not JSON at all.
             # For now, we return None if parsing fails.
             # A more robust solution might try to find the largest valid JSON substring.
@@ -48,11 +240,12 @@ def extract_and_parse_json(text: str) -> Optional[Dict[str, Any]]:
     Returns:
         A dictionary if a valid JSON block is found and parsed, otherwise None.
     """
-    json_str = extract_json_from_text(text)
-    if json_str:
+    # Extract and decode in one pass rather than validating and then re-parsing.
+    match = _FENCED_JSON_RE.search(text)
+    if match:
         try:
-            return json.loads(json_str)
-        except json.JSONDecodeError:
+            return loads_json(match.group(1).strip())
+        except ValueError:
             return None
     return None
 